@@ -0,0 +1,60 @@
+"""Bulk bet ingest throughput for Procrast.place_bets.
+
+Run from the repo root: python -m benchmarks.bench_ingest
+"""
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+from source.algo import Procrast, ACCEPTED
+from source.ingest import ingest_file
+
+NUM_USERS = 100_000
+NUM_ASSIGNMENTS = 1_000
+BETS = 1_000_000
+
+
+def make_records(procrast, rng):
+    records = []
+    for _ in range(BETS):
+        assignment = procrast.assignments[rng.randrange(NUM_ASSIGNMENTS)]
+        day = assignment.open_date.toordinal() + rng.randint(0, (assignment.due_date - assignment.open_date).days)
+        records.append((rng.randrange(NUM_USERS), rng.uniform(10, 100), day, (assignment.index,)))
+    return records
+
+
+def fresh():
+    procrast = Procrast(seed=0)
+    procrast.generate_random_data(0, NUM_ASSIGNMENTS, 0, 0, 1, 30)
+    procrast.generate_random_data(NUM_USERS, 0, 1_000, 10_000, 1, 30)
+    return procrast
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = random.Random(0)
+
+    procrast = fresh()
+    records = make_records(procrast, rng)
+    start = time.perf_counter()
+    results = procrast.place_bets(records)
+    elapsed = time.perf_counter() - start
+    print(f"in-memory: {BETS / elapsed:>10,.0f} bets/s ({results.count(ACCEPTED):,} accepted)")
+
+    procrast = fresh()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bets.jsonl")
+        with open(path, "w") as f:
+            for user, amount, day, ids in records:
+                f.write(json.dumps({"user": user, "amount": amount, "day": day, "assignments": list(ids)}) + "\n")
+        start = time.perf_counter()
+        results = ingest_file(procrast, path)
+        elapsed = time.perf_counter() - start
+    print(f"jsonl:     {BETS / elapsed:>10,.0f} bets/s ({results.count(ACCEPTED):,} accepted)")
+
+
+if __name__ == "__main__":
+    main()
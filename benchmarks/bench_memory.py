@@ -0,0 +1,67 @@
+"""Bytes allocated per bet for the object model and the columnar engine.
+
+Counts everything a bet adds: the bet itself, its date and stake, the user's
+and assignment's references to it and its entries in the stake ledger.
+
+Run from the repo root: python -m benchmarks.bench_memory
+"""
+from datetime import timedelta
+import logging
+import random
+import tracemalloc
+
+from source.algo import Procrast, User
+
+NUM_USERS = 20_000
+NUM_ASSIGNMENTS = 500
+BETS = 200_000
+
+
+def measure(procrast, users, assignments):
+    rng = random.Random(0)
+    plan = []
+    for _ in range(BETS):
+        assignment = rng.choice(assignments)
+        offset = rng.randint(0, (assignment.due_date - assignment.open_date).days)
+        plan.append((rng.choice(users), rng.uniform(10, 100), assignment, offset))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for user, amount, assignment, offset in plan:
+        procrast.place_bet(user, amount, assignment.open_date + timedelta(days=offset), [assignment])
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / BETS
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+
+    procrast = Procrast(seed=0)
+    procrast.generate_random_data(0, NUM_ASSIGNMENTS, 0, 0, 1, 30)
+    for i in range(NUM_USERS):
+        procrast.add_user(User(f"User_{i}", 1e12))
+    print(f"{'objects':>10} {measure(procrast, procrast.users, procrast.assignments):>8.1f} bytes/bet")
+
+    try:
+        from source.vector import VectorProcrast
+    except ImportError:
+        return
+    vector = VectorProcrast(seed=0)
+    vector.generate_random_data(0, NUM_ASSIGNMENTS, 0, 0, 1, 30)
+    for i in range(NUM_USERS):
+        vector.add_user(User(f"User_{i}", 1e12))
+    # Bulk-book the same volume the way generate_random_data does
+    import numpy as np
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    vector._book(rng.integers(0, NUM_USERS, BETS), rng.integers(0, NUM_ASSIGNMENTS, BETS),
+                 rng.uniform(10, 100, BETS), vector.assignment_open[rng.integers(0, NUM_ASSIGNMENTS, BETS)])
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{'columns':>10} {(after - before) / BETS:>8.1f} bytes/bet")
+
+
+if __name__ == "__main__":
+    main()
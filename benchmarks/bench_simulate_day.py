@@ -0,0 +1,46 @@
+"""Per-day cost of Procrast.simulate_day as the assignment count grows.
+
+Every population has the same 1,000 assignments settling inside the simulated
+year; the rest are due after it, so any growth in us/day is scan overhead.
+
+Run from the repo root: python -m benchmarks.bench_simulate_day
+"""
+from datetime import timedelta
+import logging
+import random
+import time
+
+from source.algo import Procrast, Assignment
+
+SIZES = [1_000, 10_000, 100_000]
+SETTLING = 1_000
+DAYS = 365
+
+
+def build(num_assignments):
+    procrast = Procrast()
+    for i in range(num_assignments):
+        open_date = procrast.current_date + timedelta(days=random.randint(0, 30))
+        if i < SETTLING:
+            due_date = open_date + timedelta(days=random.randint(1, 30))
+        else:
+            due_date = open_date + timedelta(days=DAYS + random.randint(1, 30))
+        procrast.add_assignment(Assignment(str(i), f"Assignment_{i}", open_date, due_date))
+    return procrast
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    random.seed(0)
+    print(f"{'assignments':>12} {'us/day':>10}")
+    for size in SIZES:
+        procrast = build(size)
+        start = time.perf_counter()
+        for _ in range(DAYS):
+            procrast.simulate_day()
+        elapsed = time.perf_counter() - start
+        print(f"{size:>12} {elapsed / DAYS * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
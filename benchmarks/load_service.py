@@ -0,0 +1,130 @@
+"""Sustained request rate of the local betting service (source.service).
+
+Starts `python -m source serve` in a subprocess, then drives it from keep-alive
+connections with a read-heavy mix (odds, calendar and stats reads with a share
+of bet writes) for a fixed duration, and reports requests/s and latency
+percentiles per request kind.
+
+Run from the repo root: python -m benchmarks.load_service [--connections 64] [--seconds 10]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+
+USERS = 10_000
+ASSIGNMENTS = 500
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def request(reader, writer, method, path, body=b""):
+    writer.write(b"%s %s HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n%s"
+                 % (method.encode(), path.encode(), len(body), body))
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+    return status, await reader.readexactly(length)
+
+
+async def load_windows(port):
+    # Calendar days per assignment, so odds reads ask for dates inside each window
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    windows = []
+    for i in range(ASSIGNMENTS):
+        _, body = await request(reader, writer, "GET", f"/calendar?assignment={i}")
+        windows.append(list(json.loads(body)["odds"]))
+    writer.close()
+    return windows
+
+
+def next_request(rng, write_share, windows):
+    roll = rng.random()
+    if roll < write_share:
+        assignment = rng.randrange(ASSIGNMENTS)
+        bet = {"user": rng.randrange(USERS), "amount": round(rng.uniform(1, 20), 2),
+               "date": rng.choice(windows[assignment]), "assignments": [assignment]}
+        return "bet", "POST", "/bets", json.dumps(bet).encode()
+    if roll < write_share + 0.05:
+        return "calendar", "GET", f"/calendar?assignment={rng.randrange(ASSIGNMENTS)}", b""
+    if roll < write_share + 0.06:
+        return "stats", "GET", "/stats", b""
+    assignment = rng.randrange(ASSIGNMENTS)
+    return "odds", "GET", f"/odds?assignment={assignment}&date={rng.choice(windows[assignment])}", b""
+
+
+async def client(port, deadline, write_share, windows, seed, latencies, statuses):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            kind, method, path, body = next_request(rng, write_share, windows)
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, method, path, body)
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def wait_for_server(port, timeout=120):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def pct(values, q):
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def run(args):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "source", "serve", "--port", str(port), "--seed", "1",
+                               "--users", str(USERS), "--assignments", str(ASSIGNMENTS)], stdout=subprocess.DEVNULL)
+    try:
+        await wait_for_server(port)
+        windows = await load_windows(port)
+        latencies, statuses = {}, {}
+        start = time.perf_counter()
+        deadline = start + args.seconds
+        await asyncio.gather(*(client(port, deadline, args.write_share, windows, i, latencies, statuses)
+                               for i in range(args.connections)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{args.connections} connections, {elapsed:.1f}s: {total} requests, {total / elapsed:,.0f} req/s")
+    for kind, values in sorted(latencies.items()):
+        values.sort()
+        print(f"  {kind:<9} {len(values):>8}  p50 {pct(values, 0.5) * 1e3:6.2f} ms  "
+              f"p99 {pct(values, 0.99) * 1e3:6.2f} ms")
+    print("  statuses", dict(sorted(statuses.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-share", type=float, default=0.1, help="fraction of requests that place bets")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
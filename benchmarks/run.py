@@ -0,0 +1,271 @@
+"""Benchmark suite for source.algo with regression checks.
+
+Every tracked operation runs at each population size on a book generated
+from a fixed seed and start date. Each timing loops the operation until
+--min-time seconds have been spent in it (or --max-time seconds have passed,
+setups included) and records the time per call. The best of --repeat timings,
+each taken in a fresh process, is kept. Operations that change what the next
+call would do get a fresh setup for every call.
+Results are written as JSON. When a baseline file is given, any operation
+slower than baseline * (1 + threshold) is reported and the run exits with
+status 1.
+
+Run from the repo root:
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --baseline bench.json --threshold 0.25
+    python -m benchmarks.run --sizes small medium --only simulate_day
+"""
+from datetime import datetime
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import time
+
+from source.algo import Procrast
+from source.scheduler import Scheduler
+
+SEED = 1234
+START = datetime(2024, 1, 1, 9)
+SIZES = {
+    "small": (100, 50),
+    "medium": (10_000, 500),
+    "large": (100_000, 2_000),
+}
+SIM_DAYS = (7, 30, 90, 365)
+BET_BATCH = 1_000
+
+
+def build(size, days=0):
+    num_users, num_assignments = SIZES[size]
+    procrast = Procrast(seed=SEED)
+    procrast.current_date = START
+    procrast.generate_random_data(num_users, num_assignments, 100, 1000, 1, 30)
+    for _ in range(days):
+        procrast.simulate_day()
+    procrast.odds_cache.clear()
+    return procrast
+
+
+def bench_generate_random_data(size):
+    num_users, num_assignments = SIZES[size]
+    procrast = Procrast(seed=SEED)
+    procrast.current_date = START
+    return lambda: procrast.generate_random_data(num_users, num_assignments, 100, 1000, 1, 30)
+
+
+def bench_place_bet(size):
+    procrast = build(size)
+    users, assignments = procrast.users, procrast.assignments
+    plan = [(users[i % len(users)], assignments[i % len(assignments)]) for i in range(BET_BATCH)]
+
+    def run():
+        for user, assignment in plan:
+            procrast.place_bet(user, 1.0, assignment.open_date, [assignment])
+    return run
+
+
+def bench_calculate_odds(size):
+    procrast = build(size)
+    queries = [(a, a.open_date) for a in procrast.assignments]
+
+    def run():
+        procrast.odds_cache.clear()
+        for assignment, date in queries:
+            procrast.calculate_odds(assignment, date)
+    return run
+
+
+def bench_get_calendar_odds(size):
+    procrast = build(size)
+
+    def run():
+        procrast.odds_cache.clear()
+        for assignment in procrast.assignments:
+            procrast.get_calendar_odds(assignment)
+    return run
+
+
+def bench_publish_odds(size):
+    procrast = build(size)
+    return procrast.publish_odds
+
+
+def bench_simulate_day(size, days):
+    procrast = build(size)
+
+    def run():
+        for _ in range(days):
+            procrast.simulate_day()
+    return run
+
+
+def bench_scheduler(size, days):
+    procrast = build(size)
+    return lambda: Scheduler(procrast).run_days(days)
+
+
+def bench_checkpoint(size):
+    procrast = build(size, days=60)
+    return procrast.checkpoint
+
+
+def bench_restore(size):
+    procrast = build(size, days=60)
+    checkpoint = procrast.checkpoint()
+    for _ in range(30):
+        procrast.simulate_day()
+    return lambda: procrast.restore(checkpoint)
+
+
+def bench_finalize_simulation(size):
+    procrast = build(size, days=60)
+    return procrast.finalize_simulation
+
+
+def bench_get_detailed_statistics(size):
+    procrast = build(size, days=60)
+    return procrast.get_detailed_statistics
+
+
+BENCHMARKS = {
+    "generate_random_data": bench_generate_random_data,
+    "place_bet": bench_place_bet,
+    "calculate_odds": bench_calculate_odds,
+    "get_calendar_odds": bench_get_calendar_odds,
+    "publish_odds": bench_publish_odds,
+    **{f"simulate_day[{days}]": (lambda size, days=days: bench_simulate_day(size, days)) for days in SIM_DAYS},
+    **{f"scheduler[{days}]": (lambda size, days=days: bench_scheduler(size, days)) for days in SIM_DAYS},
+    "checkpoint": bench_checkpoint,
+    "restore": bench_restore,
+    "finalize_simulation": bench_finalize_simulation,
+    "get_detailed_statistics": bench_get_detailed_statistics,
+}
+
+# Calling these again does the same work, so one setup serves the whole loop
+REUSABLE = {"calculate_odds", "get_calendar_odds", "checkpoint", "restore", "finalize_simulation",
+            "get_detailed_statistics"}
+
+
+def time_once(name, size, min_time=0.2, max_time=1.0):
+    # Sub-millisecond operations are looped (like timeit's autorange) so a
+    # single timer blip cannot fail the regression gate. Unless the operation
+    # is REUSABLE, every call gets a fresh setup so mutating operations always
+    # start from the same state; only the returned callable is timed, but the
+    # loop stops after `max_time` seconds of setups and calls so cheap
+    # operations with costly setups still finish. Returns seconds per call.
+    factory, reuse = BENCHMARKS[name], name in REUSABLE
+    elapsed = 0.0
+    calls = 0
+    gc.collect()
+    run = factory(size) if reuse else None
+    deadline = time.perf_counter() + max_time
+    while elapsed < min_time and (calls == 0 or time.perf_counter() < deadline):
+        if not reuse:
+            run = factory(size)
+        # As in timeit, a collection triggered by setup garbage is not the operation's cost
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            elapsed += time.perf_counter() - start
+        finally:
+            gc.enable()
+        calls += 1
+    return elapsed / calls
+
+
+def measure(name, size, repeat, min_time=0.2, max_time=1.0):
+    # Best of `repeat` timings, each in a new interpreter: timings move more
+    # between processes (memory layout) than between repeats within one, so
+    # in-process repeats would share one process's luck
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, initializer=_quiet, maxtasksperchild=1) as pool:
+        return min(pool.apply(time_once, (name, size, min_time, max_time)) for _ in range(repeat))
+
+
+def _quiet():
+    logging.disable(logging.WARNING)
+
+
+def compare(results, baseline, threshold, overrides, min_delta=0.0):
+    regressions = []
+    for size, ops in results.items():
+        for op, seconds in ops.items():
+            before = baseline.get(size, {}).get(op)
+            if before is None:
+                continue
+            limit = overrides.get(op, threshold)
+            # Differences below min_delta are timer and call overhead, not regressions
+            if seconds > before * (1 + limit) and seconds - before > min_delta:
+                regressions.append((size, op, before, seconds, limit))
+    return regressions
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values:
+        op, _, limit = value.partition("=")
+        overrides[op] = float(limit)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--only", nargs="+", help="benchmark name prefixes to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to loop each operation per repeat")
+    parser.add_argument("--max-time", type=float, default=1.0,
+                        help="wall-clock cap per repeat, setups included")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown as a fraction (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=1e-5,
+                        help="ignore slowdowns smaller than this many seconds per call")
+    parser.add_argument("--op-threshold", action="append", default=[], metavar="OP=FRACTION",
+                        help="per-operation threshold override, e.g. place_bet=0.5")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    names = [name for name in BENCHMARKS if not args.only or any(name.startswith(p) for p in args.only)]
+
+    results = {}
+    for size in args.sizes:
+        results[size] = {}
+        for name in names:
+            seconds = measure(name, size, args.repeat, args.min_time, args.max_time)
+            results[size][name] = seconds
+            print(f"{size:>7} {name:<26} {seconds * 1e3:>10.3f} ms", flush=True)
+
+    with open(args.out, "w") as f:
+        json.dump({
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": SEED,
+                "repeat": args.repeat,
+                "min_time": args.min_time,
+                "max_time": args.max_time,
+                "created": datetime.now().isoformat(timespec="seconds"),
+            },
+            "results": results,
+        }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, parse_overrides(args.op_threshold), args.min_delta)
+        for size, op, before, after, limit in regressions:
+            print(f"REGRESSION {size} {op}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms (limit +{limit:.0%})")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
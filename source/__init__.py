@@ -0,0 +1,4 @@
+import logging
+
+# Library modules only log; entry points (ui.main, the CLI) decide where it goes
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,5 @@
+import sys
+
+from source.cli import main
+
+sys.exit(main())
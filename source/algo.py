@@ -1,89 +1,974 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, defaultdict
+from collections.abc import Sequence
 from datetime import datetime, timedelta
+from itertools import islice
+import gc
+import math
 import random
 import logging
+import time
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from source.metrics import instrumented
+
+# Logging is configured by the entry points; hot paths check the level before
+# building messages so per-bet lines cost nothing when they are not emitted
+logger = logging.getLogger(__name__)
+
+# Per-record results of Procrast.place_bets
+ACCEPTED = 0
+INSUFFICIENT_BALANCE = 1
+UNKNOWN_USER = 2
+UNKNOWN_ASSIGNMENT = 3
+INVALID_BET = 4  # ids that are not ints, or an amount that is not finite and positive
+
+class StakeLedger:
+    # Stakes kept sorted by selected day ordinal with running totals, so the amount
+    # bet up to a day is a bisect instead of a scan over every bet. Columns are
+    # typed arrays to avoid a boxed float/int per entry. Columns handed to a
+    # Checkpoint are shared and copied on the next write.
+    __slots__ = ('days', 'amounts', 'cumulative', '_stale_from', '_shared')
+
+    def __init__(self):
+        self.days = array('l')
+        self.amounts = array('d')
+        self.cumulative = array('d', [0.0])
+        self._stale_from = None  # first position whose running total needs rebuilding
+        self._shared = False  # columns also held by a checkpoint
+
+    def share(self):
+        # Current columns, frozen for a checkpoint
+        if self._stale_from is not None:
+            self._rebuild()
+        self._shared = True
+        return self.days, self.amounts, self.cumulative
+
+    def restore(self, columns):
+        self.days, self.amounts, self.cumulative = columns
+        self._stale_from = None
+        self._shared = True
+
+    def _unshare(self):
+        self.days = array('l', self.days)
+        self.amounts = array('d', self.amounts)
+        self.cumulative = array('d', self.cumulative)
+        self._shared = False
+
+    def add(self, day, amount):
+        if self._shared:
+            self._unshare()
+        i = bisect_right(self.days, day)
+        self.days.insert(i, day)
+        self.amounts.insert(i, amount)
+        if i == len(self.days) - 1 and self._stale_from is None:
+            self.cumulative.append(self.cumulative[-1] + amount)
+        else:
+            self.cumulative.append(0.0)
+            self._stale_from = i if self._stale_from is None else min(i, self._stale_from)
+
+    def extend(self, days, amounts):
+        # Bulk load: merge and sort once rather than inserting entry by entry
+        entries = sorted(zip(list(self.days) + list(days), list(self.amounts) + list(amounts)), key=lambda e: e[0])
+        self.days = array('l', (day for day, _ in entries))
+        self.amounts = array('d', (amount for _, amount in entries))
+        self.cumulative = array('d', [0.0]) * (len(entries) + 1)
+        self._stale_from = 0
+        self._shared = False
+
+    def _rebuild(self):
+        start = self._stale_from
+        running = self.cumulative[start]
+        for i in range(start, len(self.amounts)):
+            running += self.amounts[i]
+            self.cumulative[i + 1] = running
+        self._stale_from = None
+
+    def total_until(self, day):
+        if self._stale_from is not None:
+            self._rebuild()
+        return self.cumulative[bisect_right(self.days, day)]
+
+    def total(self):
+        if self._stale_from is not None:
+            self._rebuild()
+        return self.cumulative[-1]
+
+    def totals_at(self, days):
+        # Running totals for an ascending run of days in a single merge pass
+        if self._stale_from is not None:
+            self._rebuild()
+        totals = []
+        i = 0
+        for day in days:
+            while i < len(self.days) and self.days[i] <= day:
+                i += 1
+            totals.append(self.cumulative[i])
+        return totals
+
+class OddsCache:
+    # Bounded LRU of odds keyed by (assignment, date). A date of None holds the
+    # assignment's whole calendar. Keys are also grouped per assignment so a bet
+    # only drops the entries it can change.
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._keys = defaultdict(set)  # assignment -> cached keys
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._keys[key[0]].add(key)
+        while len(self._entries) > self.maxsize:
+            (assignment, date), _ = self._entries.popitem(last=False)
+            self._forget(assignment, (assignment, date))
+
+    def _forget(self, assignment, key):
+        keys = self._keys[assignment]
+        keys.discard(key)
+        if not keys:
+            del self._keys[assignment]
+
+    def invalidate(self, assignment, since_day=None):
+        # Drop the calendar and every point on or after `since_day` (all points if None)
+        stale = [key for key in self._keys.get(assignment, ())
+                 if since_day is None or key[1] is None or key[1].toordinal() >= since_day]
+        for key in stale:
+            del self._entries[key]
+            self._forget(assignment, key)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
+
+class OddsSnapshot:
+    # Immutable odds for every assignment on every day of its window, as of
+    # Procrast.odds_version == version. rows[assignment index] is (open day
+    # ordinal, odds per day), so a lookup is two index operations. Readers may
+    # hold a snapshot for as long as they like; publishing swaps in a new one.
+    __slots__ = ('version', 'created', 'house_take', 'rows')
+
+    def __init__(self, version, house_take, rows):
+        self.version = version
+        self.created = time.monotonic()
+        self.house_take = house_take
+        self.rows = rows
+
+    def odds(self, assignment_index, day):
+        # None outside the assignment's window or for assignments newer than the snapshot
+        if assignment_index >= len(self.rows):
+            return None
+        first_day, odds = self.rows[assignment_index]
+        i = day - first_day
+        return odds[i] if 0 <= i < len(odds) else None
+
+    def age(self):
+        return time.monotonic() - self.created
+
+class Checkpoint:
+    # Run state of a Procrast as of Procrast.checkpoint(), for restore(). The
+    # population itself is not copied: users, assignments and bets stay shared
+    # with the book and only their mutable fields are kept, as typed columns in
+    # user and bet order. Stake ledgers are shared copy-on-write, so a branch
+    # that places no bets never copies one.
+    __slots__ = ('current_date', 'house_take', 'generations', 'streams', 'daily_stats', 'totals',
+                 'odds_snapshot', 'odds_dirty', 'odds_pending', 'num_users', 'num_assignments',
+                 'user_bets', 'balances', 'staked', 'won', 'assignment_bets', 'ledgers', 'completed',
+                 'potential_returns')
+
+    def __init__(self, procrast):
+        users, assignments = procrast.users, procrast.assignments
+        self.current_date = procrast.current_date
+        self.house_take = procrast.house_take
+        self.generations = procrast.generations
+        self.streams = procrast.streams.getstate()
+        self.daily_stats = procrast.daily_stats.copy()
+        self.totals = (procrast.total_bets, procrast.total_bet_amount, procrast.completed_bets,
+                       procrast.total_paid)
+        self.odds_snapshot = procrast.odds_snapshot
+        self.odds_dirty = frozenset(procrast._odds_dirty)
+        self.odds_pending = procrast._odds_pending
+        self.num_users = len(users)
+        self.num_assignments = len(assignments)
+
+        self.user_bets = array('l', (len(user.bets) for user in users))
+        self.balances = array('d', (user.balance for user in users))
+        self.staked = array('d', (user.staked for user in users))
+        self.won = array('d', (user.won for user in users))
+        self.assignment_bets = array('l', (len(assignment.bets) for assignment in assignments))
+        self.ledgers = [assignment.ledger.share() for assignment in assignments]
+        bets = [bet for user in users for bet in user.bets]
+        self.completed = bytes(bet.completed for bet in bets)
+        # NaN stands in for a potential_return of None
+        self.potential_returns = array('d', (math.nan if bet.potential_return is None else bet.potential_return
+                                             for bet in bets))
+
+class ChangeFeed:
+    # Which rows (user or assignment indexes) changed, and when. Readers remember
+    # the `seq` they last synced at and ask whether a row changed after it, so a
+    # view can re-render only rows that are both visible and stale.
+    __slots__ = ('seq', 'cleared', '_last')
+
+    def __init__(self):
+        self.seq = 0
+        self.cleared = 0  # seq of the last clear(); every row counts as changed then
+        self._last = {}  # index -> seq of its latest change
+
+    def touch(self, index):
+        self.seq += 1
+        self._last[index] = self.seq
+
+    def changed(self, index, since):
+        return self.cleared > since or self._last.get(index, 0) > since
+
+    def clear(self):
+        self.seq += 1
+        self.cleared = self.seq
+        self._last = {}
+
+class NameIndex:
+    # Case-insensitive prefix search over names, for type-ahead lookups.
+    # Additions are buffered and merged on the next search, so adding a whole
+    # generated population costs one sort rather than an insort per name.
+    def __init__(self):
+        self._sorted = []  # (folded name, index)
+        self._pending = []
+
+    def add(self, name, index):
+        self._pending.append((name.casefold(), index))
+
+    def clear(self):
+        self._sorted = []
+        self._pending = []
+
+    def __len__(self):
+        return len(self._sorted) + len(self._pending)
+
+    def __getitem__(self, position):
+        # Row index at a position in name order
+        self._merge()
+        return self._sorted[position][1]
+
+    def _merge(self):
+        if self._pending:
+            self._sorted.extend(self._pending)
+            self._sorted.sort()
+            self._pending = []
+
+    def prefix_range(self, prefix):
+        # Positions [lo, hi) of every name starting with `prefix`
+        self._merge()
+        prefix = prefix.casefold()
+        lo = bisect_left(self._sorted, (prefix,))
+        hi = bisect_left(self._sorted, (prefix + "\U0010ffff",), lo)
+        return lo, hi
+
+    def lookup(self, name):
+        # Indexes of rows whose name matches `name` ignoring case
+        self._merge()
+        key = name.casefold()
+        i = bisect_left(self._sorted, (key,))
+        found = []
+        while i < len(self._sorted) and self._sorted[i][0] == key:
+            found.append(self._sorted[i][1])
+            i += 1
+        return found
+
+    def search(self, prefix, limit=50):
+        lo, hi = self.prefix_range(prefix)
+        return [index for _, index in self._sorted[lo:min(hi, lo + limit)]]
+
+def completion_stream(streams, day, completion_rate_mean, completion_rate_std):
+    # A day's completion draws: its stream and the day's completion rate, which
+    # is always the first draw from it
+    rng = streams.derive("completion", day)
+    return rng, min(max(rng.gauss(completion_rate_mean, completion_rate_std), 0), 1)
+
+ROLLUPS = ("week", "month")
+BUCKET_DAYS = {"week": 7, "month": 31}  # longest bucket at each level
+
+def _bucket(level, day):
+    # First day ordinal of the week (from Monday) or month holding `day`
+    date = datetime.fromordinal(day)
+    return day - date.weekday() if level == "week" else date.replace(day=1).toordinal()
+
+def _bucket_end(level, key):
+    if level == "week":
+        return key + 7
+    date = datetime.fromordinal(key)
+    return date.replace(year=date.year + date.month // 12, month=date.month % 12 + 1).toordinal()
+
+class DailyStats(Sequence):
+    # Procrast.daily_stats: one row per simulated day, for the last `capacity`
+    # days. Days the scheduler skipped because nothing settled are not stored;
+    # their row is rebuilt on access from that day's completion stream, exactly
+    # as simulate_day would have made it. Days leaving the window are folded
+    # into week and month rollups (bet totals, completion rate mean and
+    # variance), each capped at a number of buckets, so query() still reaches
+    # older history at those resolutions. Skipped days are drawn into a rollup
+    # only when a query first needs its bucket.
+    def __init__(self, streams, capacity=1_000, week_capacity=520, month_capacity=1_200):
+        self._streams = streams
+        self.capacity = capacity
+        self._rows = {}  # day ordinal -> stored row
+        self._span_starts = []  # first day of each span of skipped days, ascending
+        self._spans = []  # (first day, end day, mean, std, time of day) of skipped days
+        self.first = None  # first day ordinal in the window
+        self.end = None  # one past the last day covered
+        self.start = None  # first day ever covered, including days rolled up since
+        # Days before `first`, per level: bucket start ordinal -> (days, rate sum,
+        # rate sum of squares, total bets, completed bets)
+        self._rollups = {"week": {}, "month": {}}
+        self._rollup_capacity = {"week": week_capacity, "month": month_capacity}
+        # Skipped days rolled up but not drawn yet, per level: bucket start
+        # ordinal -> ((first day, end day, mean, std), ...)
+        self._pending = {"week": {}, "month": {}}
+
+    def __len__(self):
+        return 0 if self.first is None else self.end - self.first
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        day = self.first + i
+        row = self._rows.get(day)
+        return row if row is not None else self._fill(day)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, row):
+        # Days arrive in ascending order; one already rolled up is dropped
+        day = row['date'].toordinal()
+        if self.first is None:
+            self.first = day
+            if self.start is None:
+                self.start = day
+        elif day < self.first:
+            return
+        self.end = max(self.end or day + 1, day + 1)
+        self._rows[day] = row
+        self._evict()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def cover(self, start_date, end_day, completion_rate_mean, completion_rate_std):
+        # Declare days from start_date up to end_day as simulated; the ones
+        # without a stored row are filled in on access
+        first = start_date.toordinal()
+        if end_day <= first:
+            return
+        time_of_day = start_date - datetime.fromordinal(first)
+        self._span_starts.append(first)
+        self._spans.append((first, end_day, completion_rate_mean, completion_rate_std, time_of_day))
+        if self.first is None:
+            self.first = first
+            if self.start is None:
+                self.start = first
+        self.end = max(self.end or end_day, end_day)
+        self._evict()
+
+    def _evict(self):
+        # Keep the window at `capacity` days, rolling up the ones that leave it.
+        # Stored rows are added to the rollups as they go; spans of skipped days
+        # are only recorded against the buckets they fall in and drawn on query.
+        if len(self) <= self.capacity:
+            return
+        first = self.end - self.capacity
+        leaving = []
+        while self._rows:
+            day = next(iter(self._rows))  # rows arrive, so are kept, in day order
+            if day >= first:
+                break
+            leaving.append((day, day + 1, self._rows.pop(day)))
+        k = 0
+        while k < len(self._spans) and self._spans[k][0] < first:
+            lo, hi, mean, std, _ = self._spans[k]
+            leaving.append((max(lo, self.first), min(hi, first), (mean, std)))
+            if hi > first:
+                break
+            k += 1
+        del self._span_starts[:k]
+        del self._spans[:k]
+        self.first = first
+        leaving.sort(key=lambda part: part[0])
+        for level in ROLLUPS:
+            for lo, hi, part in leaving:
+                if isinstance(part, dict):
+                    rate = part['completion_rate']
+                    self._roll(level, lo, (1, rate, rate * rate, part['total_bets'], part['completed_bets']))
+                    continue
+                # Buckets more than `capacity` before the end would only be dropped again
+                key = _bucket(level, max(lo, hi - BUCKET_DAYS[level] * (self._rollup_capacity[level] + 1)))
+                while key < hi:
+                    end = _bucket_end(level, key)
+                    pending = self._pending[level]
+                    pending[key] = pending.get(key, ()) + ((max(lo, key), min(hi, end)) + part,)
+                    self._roll(level, key, (0, 0.0, 0.0, 0, 0))
+                    key = end
+
+    def _roll(self, level, day, value):
+        # Add `value` to the bucket holding `day`, dropping the oldest bucket
+        # past the level's capacity
+        buckets = self._rollups[level]
+        key = _bucket(level, day)
+        n, total, squares, bets, completed = buckets.get(key, (0, 0.0, 0.0, 0, 0))
+        buckets[key] = (n + value[0], total + value[1], squares + value[2], bets + value[3],
+                        completed + value[4])
+        if len(buckets) > self._rollup_capacity[level]:
+            dropped = next(iter(buckets))
+            del buckets[dropped]
+            self._pending[level].pop(dropped, None)
+
+    def _draw(self, level, start_day, end_day):
+        # Draw the skipped days rolled up into buckets overlapping [start_day, end_day)
+        buckets, pending = self._rollups[level], self._pending[level]
+        for key in [key for key in pending if key < end_day and _bucket_end(level, key) > start_day]:
+            n, total, squares, bets, completed = buckets[key]
+            for lo, hi, mean, std in pending.pop(key):
+                for day in range(lo, hi):
+                    _, rate = completion_stream(self._streams, day, mean, std)
+                    n, total, squares = n + 1, total + rate, squares + rate * rate
+            buckets[key] = (n, total, squares, bets, completed)
+
+    def _fill(self, day):
+        i = bisect_right(self._span_starts, day) - 1
+        if i < 0 or day >= self._spans[i][1]:
+            raise IndexError(day)
+        _, _, mean, std, time_of_day = self._spans[i]
+        _, rate = completion_stream(self._streams, day, mean, std)
+        return {'date': datetime.fromordinal(day) + time_of_day, 'completion_rate': rate,
+                'total_bets': 0, 'completed_bets': 0}
+
+    def _fold(self, buckets, level, start, end):
+        # Add the window's days in [start, end) to `buckets`
+        for day in range(start, end):
+            row = self._rows.get(day)
+            if row is None:
+                try:
+                    row = self._fill(day)
+                except IndexError:
+                    continue  # a gap nothing was simulated for
+            rate = row['completion_rate']
+            key = _bucket(level, day)
+            n, total, squares, bets, completed = buckets.get(key, (0, 0.0, 0.0, 0, 0))
+            buckets[key] = (n + 1, total + rate, squares + rate * rate, bets + row['total_bets'],
+                            completed + row['completed_bets'])
+
+    def query(self, start=None, end=None, resolution="auto", max_points=None):
+        # Rows for dates in [start, end) (default: everything still held) at
+        # "day", "week" or "month" resolution. Day rows are the stored rows and
+        # only reach back to the start of the window. Rollup rows are dated at
+        # the start of their bucket, add 'days' and 'completion_rate_var', and
+        # are returned whole when they overlap the range. "auto" picks the
+        # finest resolution that reaches `start` in at most `max_points` rows.
+        if self.first is None:
+            return []
+        start_day = start.toordinal() if start is not None else None
+        end_day = min(end.toordinal(), self.end) if end is not None else self.end
+        if resolution == "auto":
+            resolution = self._resolution(start_day, end_day, max_points)
+        if resolution == "day":
+            lo = self.first if start_day is None else max(start_day, self.first)
+            return [self[day - self.first] for day in range(lo, end_day)]
+
+        self._draw(resolution, self.start if start_day is None else start_day, end_day)
+        buckets = dict(self._rollups[resolution])
+        self._fold(buckets, resolution, self.first, end_day)
+        rows = []
+        for key, (n, total, squares, bets, completed) in buckets.items():
+            if key >= end_day or start_day is not None and _bucket_end(resolution, key) <= start_day:
+                continue
+            mean = total / n
+            rows.append({'date': datetime.fromordinal(key), 'days': n, 'completion_rate': mean,
+                         'completion_rate_var': max(squares / n - mean * mean, 0.0),
+                         'total_bets': bets, 'completed_bets': completed})
+        return rows
+
+    def _resolution(self, start_day, end_day, max_points):
+        # Oldest day each level still holds. A rollup that has dropped buckets
+        # starts at its oldest bucket; otherwise it reaches the first day covered.
+        oldest = {"day": self.first}
+        for level in ROLLUPS:
+            oldest[level] = max(next(iter(self._rollups[level]), self.first), self.start)
+        if start_day is None:
+            start_day = self.start
+        for resolution, days in (("day", 1), ("week", 7)):
+            if oldest[resolution] <= start_day and (max_points is None or (end_day - start_day) / days <= max_points):
+                return resolution
+        return "month"
+
+    def copy(self):
+        # Rows are never changed once stored, so copies share them
+        other = DailyStats(self._streams, self.capacity)
+        other._rows = dict(self._rows)
+        other._span_starts = list(self._span_starts)
+        other._spans = list(self._spans)
+        other.first, other.end, other.start = self.first, self.end, self.start
+        other._rollups = {level: dict(buckets) for level, buckets in self._rollups.items()}
+        other._rollup_capacity = dict(self._rollup_capacity)
+        other._pending = {level: dict(pending) for level, pending in self._pending.items()}
+        return other
+
+    def getstate(self):
+        # Rollups of the days already out of the window; storage saves the
+        # window itself as rows
+        state = {level: list(map(list, buckets.items())) for level, buckets in self._rollups.items()}
+        state["start"] = self.start
+        state["pending"] = {level: [[key, list(map(list, parts))] for key, parts in pending.items()]
+                            for level, pending in self._pending.items()}
+        return state
+
+    def setstate(self, state):
+        self._rollups = {level: {key: tuple(value) for key, value in state[level]} for level in ROLLUPS}
+        self.start = state["start"]
+        self._pending = {level: {key: tuple(map(tuple, parts)) for key, parts in state["pending"][level]}
+                         for level in ROLLUPS}
+
+class RandomStreams:
+    # Independent random streams derived from one root seed. Named streams
+    # ("users", "assignments") are consumed in order; keyed streams come from
+    # derive() and depend only on the seed and their key, so a user's bets or a
+    # day's completions are the same however the run is chunked or distributed.
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self._named = {}
+
+    def derive(self, name, *key):
+        # String seeds are hashed with SHA-512, so neighbouring keys give unrelated streams
+        return random.Random("/".join(map(str, (self.seed, name) + key)))
+
+    def __getitem__(self, name):
+        stream = self._named.get(name)
+        if stream is None:
+            stream = self._named[name] = self.derive(name)
+        return stream
+
+    def getstate(self):
+        return {"seed": self.seed, "named": {name: stream.getstate() for name, stream in self._named.items()}}
+
+    def setstate(self, state):
+        self.seed = state["seed"]
+        self._named = {}
+        for name, (version, internal, gauss_next) in state["named"].items():
+            self[name].setstate((version, tuple(internal), gauss_next))
+
+def _valid_amount(amount):
+    return isinstance(amount, (int, float)) and not isinstance(amount, bool) and math.isfinite(amount) and amount > 0
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _valid_record(user_index, amount, day, ids):
+    return (_is_int(user_index) and _valid_amount(amount) and _is_int(day)
+            and isinstance(ids, (tuple, list)) and all(_is_int(a) for a in ids))
 
 class Assignment:
+    __slots__ = ('id', 'name', 'open_date', 'due_date', 'bets', 'ledger', 'index')
+
     def __init__(self, id: str, name: str, open_date: datetime, due_date: datetime):
         self.id = id
         self.name = name
         self.open_date = open_date
         self.due_date = due_date
         self.bets = []
+        self.ledger = StakeLedger()
+        self.index = None  # position in Procrast.assignments once added
 
 class Bet:
-    def __init__(self, user, amount: float, selected_date: datetime, assignments):
+    # Bets are the bulk of a population, so they hold the selected day as an
+    # ordinal and their assignments as Procrast.assignments indexes
+    __slots__ = ('user', 'amount', 'day', 'assignment_ids', 'completed', 'potential_return')
+
+    def __init__(self, user, amount: float, day: int, assignment_ids: tuple):
         self.user = user
         self.amount = amount
-        self.selected_date = selected_date
-        self.assignments = assignments
+        self.day = day
+        self.assignment_ids = assignment_ids
         self.completed = False
         self.potential_return = None
 
+    @property
+    def selected_date(self):
+        return datetime.fromordinal(self.day)
+
 class User:
+    __slots__ = ('name', 'balance', 'bets', 'staked', 'won', 'index')
+
     def __init__(self, name: str, balance: float):
         self.name = name
         self.balance = balance
         self.bets = []
+        self.staked = 0.0  # running total of accepted stakes
+        self.won = 0.0  # running total of payouts
+        self.index = None  # position in Procrast.users once added
 
 class Procrast:
-    def __init__(self):
+    def __init__(self, seed=None, odds_cache_size=100_000, daily_stats_capacity=1_000):
+        self.streams = RandomStreams(seed)
+        self.daily_stats_capacity = daily_stats_capacity  # raw days kept; older ones are rolled up
+        self.generations = 0  # generate_random_data calls so far; keys their bet streams
         self.assignments = []
         self.users = []
         self.current_date = datetime.now()
+        self.odds_cache = OddsCache(odds_cache_size)
+        self.odds_version = 0  # bumped whenever a change can move any odds
+        self.odds_snapshot = OddsSnapshot(0, None, ())
+        self.odds_publish_every = None  # publish automatically after this many bets
+        self._odds_dirty = set()  # assignment indexes changed since odds_snapshot
+        self._odds_pending = 0  # bets since odds_snapshot
         self.house_take = 0.05  # 5% house take by default
-        self.daily_stats = []
+        self.daily_stats = DailyStats(self.streams, daily_stats_capacity)
+        self._reset_indexes()
+        self.user_feed = ChangeFeed()  # users added or rebalanced
+        self.assignment_feed = ChangeFeed()  # assignments added
+        self.journal = None  # optional storage.BetJournal recording accepted bets
+        self.metrics = None  # optional metrics.Metrics collecting counters and latencies
+        self._reset_totals()
+
+    @property
+    def house_take(self):
+        return self._house_take
+
+    @house_take.setter
+    def house_take(self, value):
+        # Every cached odd depends on the house take
+        if value != getattr(self, '_house_take', None):
+            self._house_take = value
+            self.odds_cache.clear()
+            self._odds_changed(range(len(self.assignments)), 0)
+
+    def _reset_indexes(self):
+        # Lookups on the betting path: names and ids map to the first row added
+        # with them, as the old linear scans did
+        self.users_by_name = {}
+        self.assignments_by_id = {}
+        self.assignments_by_name = {}
+        self.assignments_by_due = defaultdict(list)  # due day ordinal -> assignments
+        self.due_days = []  # sorted keys of assignments_by_due
+        self.bets_by_user_day = None  # (user index, day ordinal) -> bets, built on first use
+
+    def get_user(self, name):
+        return self.users_by_name.get(name)
+
+    def get_assignment(self, id):
+        return self.assignments_by_id.get(id)
+
+    def get_assignment_by_name(self, name):
+        return self.assignments_by_name.get(name)
+
+    def assignments_due_between(self, start_day, end_day):
+        # Assignments due on day ordinals in [start_day, end_day), by due day
+        days = self.due_days
+        for i in range(bisect_left(days, start_day), bisect_left(days, end_day)):
+            yield from self.assignments_by_due[days[i]]
+
+    def user_bets_on(self, user, date):
+        # Secondary index, only built (and from then on maintained) once asked for
+        if self.bets_by_user_day is None:
+            self.bets_by_user_day = defaultdict(list)
+            for u in self.users:
+                for bet in u.bets:
+                    self.bets_by_user_day[(u.index, bet.day)].append(bet)
+        return self.bets_by_user_day.get((user.index, date.toordinal()), [])
 
     def add_user(self, user):
+        self._index_user(user)
+        logger.info("Added user: %s", user.name)
+
+    def _index_user(self, user):
+        user.index = len(self.users)
         self.users.append(user)
-        logging.info(f"Added user: {user.name}")
+        self.users_by_name.setdefault(user.name, user)
+        self.user_feed.touch(user.index)
 
     def add_assignment(self, assignment):
+        self._index_assignment(assignment)
+        logger.info("Added assignment: %s", assignment.name)
+
+    def _index_assignment(self, assignment):
+        assignment.index = len(self.assignments)
         self.assignments.append(assignment)
-        logging.info(f"Added assignment: {assignment.name}")
+        self.assignments_by_id.setdefault(assignment.id, assignment)
+        self.assignments_by_name.setdefault(assignment.name, assignment)
+        self.assignment_feed.touch(assignment.index)
+        due_day = assignment.due_date.toordinal()
+        if due_day not in self.assignments_by_due:
+            insort(self.due_days, due_day)
+        self.assignments_by_due[due_day].append(assignment)
+        self._odds_changed((assignment.index,), 0)
 
     def reset(self):
         self.assignments = []
         self.users = []
         self.current_date = datetime.now()
-        self.daily_stats = []
-        logging.info("Reset Procrast instance")
+        self.daily_stats = DailyStats(self.streams, self.daily_stats_capacity)
+        self._reset_indexes()
+        self.odds_cache.clear()
+        self.user_feed.clear()
+        self.assignment_feed.clear()
+        self.odds_version += 1
+        self.odds_snapshot = OddsSnapshot(self.odds_version, self.house_take, ())
+        self._odds_dirty = set()
+        self._odds_pending = 0
+        self._reset_totals()
+        logger.info("Reset Procrast instance")
+
+    def checkpoint(self):
+        return Checkpoint(self)
+
+    def restore(self, checkpoint):
+        # Roll the book back to `checkpoint`, dropping users, assignments and bets
+        # added since. A checkpoint can be restored any number of times, so
+        # scenarios branch off one point by restore -> change -> simulate, and a
+        # branch worth returning to is itself checkpointed. A journal cannot
+        # unrecord bets, so books with one attached are refused.
+        if self.journal is not None:
+            raise ValueError("Cannot restore a checkpoint on a book with a journal attached")
+        users, assignments = self.users, self.assignments
+        removed = assignments[checkpoint.num_assignments:]
+        if len(users) != checkpoint.num_users or removed:
+            del users[checkpoint.num_users:]
+            del assignments[checkpoint.num_assignments:]
+            self._reindex()
+
+        for i, user in enumerate(users):
+            del user.bets[checkpoint.user_bets[i]:]
+            user.balance = checkpoint.balances[i]
+            user.staked = checkpoint.staked[i]
+            user.won = checkpoint.won[i]
+        changed = set()
+        for i, assignment in enumerate(assignments):
+            del assignment.bets[checkpoint.assignment_bets[i]:]
+            columns = checkpoint.ledgers[i]
+            if assignment.ledger.days is not columns[0]:
+                changed.add(i)
+                self.odds_cache.invalidate(assignment)
+            assignment.ledger.restore(columns)
+        for assignment in removed:
+            self.odds_cache.invalidate(assignment)
+        bets = (bet for user in users for bet in user.bets)
+        for bet, completed, potential_return in zip(bets, checkpoint.completed, checkpoint.potential_returns):
+            bet.completed = bool(completed)
+            bet.potential_return = None if math.isnan(potential_return) else potential_return
+
+        self.current_date = checkpoint.current_date
+        self.generations = checkpoint.generations
+        self.streams.setstate(checkpoint.streams)
+        self.daily_stats = checkpoint.daily_stats.copy()
+        self.total_bets, self.total_bet_amount, self.completed_bets, self.total_paid = checkpoint.totals
+        self.bets_by_user_day = None
+        self.user_feed.clear()
+        self.assignment_feed.clear()
+        self.odds_snapshot = checkpoint.odds_snapshot
+        self._odds_dirty = set(checkpoint.odds_dirty)
+        self._odds_pending = checkpoint.odds_pending
+        self._odds_changed(changed, 0)
+        self.house_take = checkpoint.house_take
+        logger.info("Restored checkpoint from %s", checkpoint.current_date)
+
+    def _reindex(self):
+        self._reset_indexes()
+        users, assignments = self.users, self.assignments
+        self.users, self.assignments = [], []
+        for user in users:
+            self._index_user(user)
+        for assignment in assignments:
+            self._index_assignment(assignment)
+
+    def _reset_totals(self):
+        # Running aggregates kept up to date by place_bet, simulate_day and
+        # finalize_simulation so statistics never rescan the bets
+        self.total_bets = 0
+        self.total_bet_amount = 0.0
+        self.completed_bets = 0
+        self.total_paid = 0.0
 
     def generate_random_data(self, num_users, num_assignments, min_balance, max_balance, min_duration, max_duration):
         existing_users_count = len(self.users)
+        rng = self.streams["users"]
         for i in range(existing_users_count, num_users):
-            self.users.append(User(f"User_{i}", random.uniform(min_balance, max_balance)))
+            self._index_user(User(f"User_{i}", rng.uniform(min_balance, max_balance)))
         
+        rng = self.streams["assignments"]
         for i in range(num_assignments):
-            open_date = self.current_date + timedelta(days=random.randint(0, 30))
-            due_date = open_date + timedelta(days=random.randint(min_duration, max_duration))
-            self.assignments.append(Assignment(str(i), f"Assignment_{i}", open_date, due_date))
+            open_date = self.current_date + timedelta(days=rng.randint(0, 30))
+            due_date = open_date + timedelta(days=rng.randint(min_duration, max_duration))
+            self._index_assignment(Assignment(str(i), f"Assignment_{i}", open_date, due_date))
 
-        # Generate random bets
+        # Generate random bets, each user from its own stream
+        generation = self.generations
+        self.generations += 1
+        assignments = self.assignments
+        num_assignments = len(assignments)
         for user in self.users:
-            for _ in range(random.randint(1, 5)):  # Each user places 1-5 bets
-                assignment = random.choice(self.assignments)
-                bet_amount = random.uniform(10, 100)
-                bet_date = assignment.open_date + timedelta(days=random.randint(0, (assignment.due_date - assignment.open_date).days))
+            rng = self.streams.derive("bets", generation, user.index)
+            for _ in range(rng.randint(1, 5)):  # Each user places 1-5 bets
+                # Same draw as rng.choice, against a count fixed for the whole pass
+                assignment = assignments[rng.randrange(num_assignments)]
+                bet_amount = rng.uniform(10, 100)
+                bet_date = assignment.open_date + timedelta(days=rng.randint(0, (assignment.due_date - assignment.open_date).days))
                 self.place_bet(user, bet_amount, bet_date, [assignment])
 
+    @instrumented("place_bet")
     def place_bet(self, user, amount, selected_date, assignments):
+        if not _valid_amount(amount):
+            if self.metrics is not None:
+                self.metrics.incr("bets_rejected")
+            logger.warning("Invalid bet amount %r for user %s", amount, user.name)
+            return None
+        if not assignments:
+            if self.metrics is not None:
+                self.metrics.incr("bets_rejected")
+            logger.warning("Bet by user %s names no assignments", user.name)
+            return None
         if user.balance < amount:
-            logging.warning(f"Insufficient balance for user {user.name}")
+            if self.metrics is not None:
+                self.metrics.incr("bets_rejected")
+            logger.warning("Insufficient balance for user %s", user.name)
             return None
-        bet = Bet(user, amount, selected_date, assignments)
+        day = selected_date.toordinal()
+        bet = Bet(user, amount, day, tuple(a.index for a in assignments))
         user.balance -= amount
+        user.staked += amount
         user.bets.append(bet)
+        self.user_feed.touch(user.index)
+        if self.bets_by_user_day is not None:
+            self.bets_by_user_day[(user.index, day)].append(bet)
+        self.total_bets += 1
+        self.total_bet_amount += amount
+        # A bet spanning several assignments spreads its stake evenly across them
+        share = amount / len(assignments)
         for assignment in assignments:
             assignment.bets.append(bet)
-        logging.info(f"Placed bet: User {user.name}, Amount ${amount:.2f}, Assignments: {[a.name for a in assignments]}")
+            assignment.ledger.add(day, share)
+            self.odds_cache.invalidate(assignment, day)
+        self._odds_changed(bet.assignment_ids)
+        if self.journal is not None:
+            self.journal.record(user.index, amount, day, bet.assignment_ids)
+        if self.metrics is not None:
+            self.metrics.incr("bets_accepted")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Placed bet: User %s, Amount $%.2f, Assignments: %s", user.name, amount, [a.name for a in assignments])
         return bet
 
+    @instrumented("place_bets")
+    def place_bets(self, records, chunk_size=10_000):
+        # Bulk place_bet for an iterable of (user index, amount, day ordinal,
+        # assignment indexes) records, consumed lazily a chunk at a time.
+        # Returns one status code per record (ACCEPTED, INSUFFICIENT_BALANCE, ...).
+        # Records are validated here, so they may come straight from parsed input.
+        results = bytearray()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return results
+            results += self._apply_bets(chunk)
+
+    def _apply_bets(self, chunk):
+        users, assignments, journal, touch = self.users, self.assignments, self.journal, self.user_feed.touch
+        by_user_day = self.bets_by_user_day
+        num_users, num_assignments = len(users), len(assignments)
+        statuses = bytearray(len(chunk))
+        earliest = {}  # assignment index -> earliest day staked in this chunk
+        accepted = 0
+        staked = 0.0
+
+        # Bets are long-lived and acyclic, so cyclic GC passes triggered by the
+        # allocations here would find nothing to collect
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for i, (user_index, amount, day, ids) in enumerate(chunk):
+                if not _valid_record(user_index, amount, day, ids):
+                    statuses[i] = INVALID_BET
+                    continue
+                if not 0 <= user_index < num_users:
+                    statuses[i] = UNKNOWN_USER
+                    continue
+                if not ids or not all(0 <= a < num_assignments for a in ids):
+                    statuses[i] = UNKNOWN_ASSIGNMENT
+                    continue
+                user = users[user_index]
+                if user.balance < amount:
+                    statuses[i] = INSUFFICIENT_BALANCE
+                    continue
+
+                ids = tuple(ids)
+                bet = Bet(user, amount, day, ids)
+                user.balance -= amount
+                user.staked += amount
+                user.bets.append(bet)
+                touch(user_index)
+                if by_user_day is not None:
+                    by_user_day[(user_index, day)].append(bet)
+                share = amount / len(ids)
+                for a in ids:
+                    assignment = assignments[a]
+                    assignment.bets.append(bet)
+                    assignment.ledger.add(day, share)
+                    if earliest.get(a, day) >= day:
+                        earliest[a] = day
+                if journal is not None:
+                    journal.record(user_index, amount, day, ids)
+                accepted += 1
+                staked += amount
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+            # Whatever was applied is accounted for, even if a record raised
+            self.total_bets += accepted
+            self.total_bet_amount += staked
+            for a, day in earliest.items():
+                self.odds_cache.invalidate(assignments[a], day)
+            if accepted:
+                self._odds_changed(earliest, accepted)
+        if self.metrics is not None:
+            self.metrics.incr("bets_accepted", accepted)
+            self.metrics.incr("bets_rejected", len(chunk) - accepted)
+        logger.info("Placed %d of %d bets", accepted, len(chunk))
+        return statuses
+
+    @instrumented("calculate_odds")
     def calculate_odds(self, assignment, date):
-        # Calculate total bet amount for this assignment up to the given date
-        total_bet = sum(bet.amount for bet in assignment.bets if bet.selected_date <= date)
-        
+        odds = self.odds_cache.get((assignment, date))
+        if odds is None:
+            # Calculate total bet amount for this assignment up to the given date
+            total_bet = assignment.ledger.total_until(date.toordinal())
+            odds = self._odds(assignment, date, total_bet)
+            self.odds_cache.put((assignment, date), odds)
+        return odds
+
+    def _odds(self, assignment, date, total_bet):
         # Calculate time factor: closer to due date means lower odds
         time_factor = (assignment.due_date - date).days / (assignment.due_date - assignment.open_date).days
         
@@ -97,63 +982,178 @@ class Procrast:
         else:
             return base_odds
 
+    @instrumented("simulate_day")
     def simulate_day(self, completion_rate_mean=0.7, completion_rate_std=0.1):
-        daily_completion_rate = min(max(random.gauss(completion_rate_mean, completion_rate_std), 0), 1)
+        row = self.settle_day(self.current_date, completion_rate_mean, completion_rate_std)
+        self.daily_stats.append(row)
+        self.current_date += timedelta(days=1)
+        logger.info("Simulated day: %s, Completion rate: %.2f", self.current_date, row['completion_rate'])
+
+    def settle_day(self, date, completion_rate_mean=0.7, completion_rate_std=0.1):
+        # Settle every bet on the assignments due on `date` and return its
+        # daily_stats row. Each day draws from its own stream, so a run split
+        # across processes or resumed from a snapshot settles exactly as an
+        # uninterrupted one.
+        rng, daily_completion_rate = completion_stream(self.streams, date.toordinal(), completion_rate_mean,
+                                                       completion_rate_std)
         completed_bets = 0
         total_bets = 0
 
-        for assignment in self.assignments:
-            if assignment.due_date == self.current_date:
-                for bet in assignment.bets:
-                    bet.completed = random.random() < daily_completion_rate
-                    if bet.completed:
-                        completed_bets += 1
-                    total_bets += 1
-        
-        self.daily_stats.append({
-            'date': self.current_date,
+        # Only the assignments due today settle, so look them up instead of scanning
+        for assignment in self.assignments_by_due.get(date.toordinal(), ()):
+            for bet in assignment.bets:
+                completed = rng.random() < daily_completion_rate
+                # A bet on several assignments only counts as completed if every one is
+                if len(bet.assignment_ids) > 1 and not self._is_first_leg(bet, assignment):
+                    completed = completed and bet.completed
+                if completed != bet.completed:
+                    self.completed_bets += 1 if completed else -1
+                    bet.completed = completed
+                if completed:
+                    completed_bets += 1
+                total_bets += 1
+
+        return {
+            'date': date,
             'completion_rate': daily_completion_rate,
             'total_bets': total_bets,
             'completed_bets': completed_bets
-        })
-        
-        self.current_date += timedelta(days=1)
-        logging.info(f"Simulated day: {self.current_date}, Completion rate: {daily_completion_rate:.2f}")
+        }
 
+    def _is_first_leg(self, bet, assignment):
+        # Legs settle in (due day, index) order, which is also the order
+        # simulate_day visits them within a day
+        first = min(bet.assignment_ids, key=lambda i: (self.assignments[i].due_date.toordinal(), i))
+        return first == assignment.index
+
+    @instrumented("finalize_simulation")
     def finalize_simulation(self):
-        total_pool = sum(bet.amount for assignment in self.assignments for bet in assignment.bets)
+        # Parimutuel settlement: every winning bet claims stake x odds on each of
+        # its assignments, and if the claims exceed the prize pool they are all
+        # scaled down by the same factor. Payouts do not depend on user order.
+        total_pool = self.total_bet_amount
         house_take = total_pool * self.house_take
         prize_pool = total_pool - house_take
 
-        for user in self.users:
-            for bet in user.bets:
-                if bet.completed:
-                    odds = self.calculate_odds(bet.assignments[0], bet.selected_date)
-                    bet.potential_return = bet.amount * odds
-                    actual_return = min(bet.potential_return, prize_pool)
-                    user.balance += actual_return
-                    prize_pool -= actual_return
-                    logging.info(f"User {user.name} won ${actual_return:.2f}")
+        winners, claims = self._claims()
+        total_claims = math.fsum(claims)
+        scale = 1.0 if total_claims <= prize_pool else prize_pool / total_claims
+
+        for bet, claim in zip(winners, claims):
+            bet.potential_return = claim
+            payout = claim * scale
+            bet.user.balance += payout
+            bet.user.won += payout
+            self.user_feed.touch(bet.user.index)
+
+        paid = total_claims * scale
+        self.total_paid += paid
+        logger.info("Paid $%.2f to %d winning bets", paid, len(winners))
+        return house_take, prize_pool - paid
+
+    def _claims(self):
+        winners = [bet for user in self.users for bet in user.bets if bet.completed]
+        claims = [0.0] * len(winners)
+
+        # Group the winning legs by assignment so each assignment's stake totals
+        # come from one merge pass over its ledger
+        legs = defaultdict(list)  # assignment index -> [(day, winner position, stake share)]
+        for i, bet in enumerate(winners):
+            share = bet.amount / len(bet.assignment_ids)
+            for index in bet.assignment_ids:
+                legs[index].append((bet.day, i, share))
 
-        return house_take, prize_pool
+        for index, group in legs.items():
+            assignment = self.assignments[index]
+            days = sorted({day for day, _, _ in group})
+            odds = {day: self._odds(assignment, datetime.fromordinal(day), total)
+                    for day, total in zip(days, assignment.ledger.totals_at(days))}
+            for day, i, share in group:
+                claims[i] += share * odds[day]
+        return winners, claims
+
+    def _calendar_days(self, assignment):
+        days = (assignment.due_date - assignment.open_date).days
+        return [assignment.open_date + timedelta(days=i) for i in range(days + 1)]
 
     def get_calendar_odds(self, assignment):
-        calendar = {}
-        current = assignment.open_date
-        while current <= assignment.due_date:
-            calendar[current] = self.calculate_odds(assignment, current)
-            current += timedelta(days=1)
-        return calendar
+        calendar = self.odds_cache.get((assignment, None))
+        if calendar is None:
+            dates = self._calendar_days(assignment)
+            totals = assignment.ledger.totals_at(date.toordinal() for date in dates)
+            calendar = {date: self._odds(assignment, date, total) for date, total in zip(dates, totals)}
+            self.odds_cache.put((assignment, None), calendar)
+        return dict(calendar)
+
+    def _odds_changed(self, assignment_indexes, bets=1):
+        self._odds_dirty.update(assignment_indexes)
+        self.odds_version += 1
+        self._odds_pending += bets
+        if self.odds_publish_every is not None and self._odds_pending >= self.odds_publish_every:
+            self.publish_odds()
+
+    def publish_odds(self):
+        # New snapshot sharing every row the changes since the last one left alone
+        previous = self.odds_snapshot
+        if previous.version == self.odds_version:
+            return previous
+        rows = list(previous.rows)
+        rows.extend([None] * (len(self.assignments) - len(rows)))
+        for i in self._odds_dirty:
+            assignment = self.assignments[i]
+            dates = self._calendar_days(assignment)
+            totals = assignment.ledger.totals_at(date.toordinal() for date in dates)
+            rows[i] = (assignment.open_date.toordinal(),
+                       tuple(self._odds(assignment, date, total) for date, total in zip(dates, totals)))
+        self._odds_dirty = set()
+        self._odds_pending = 0
+        self.odds_snapshot = OddsSnapshot(self.odds_version, self.house_take, tuple(rows))
+        return self.odds_snapshot
+
+    def get_odds_snapshot(self, max_staleness=None):
+        # The published snapshot, rebuilt first if it is missing changes and is
+        # more than `max_staleness` seconds old (never rebuilt when None). Threads
+        # other than the one placing bets should read `odds_snapshot` directly.
+        snapshot = self.odds_snapshot
+        if (max_staleness is not None and snapshot.version != self.odds_version
+                and snapshot.age() >= max_staleness):
+            snapshot = self.publish_odds()
+        return snapshot
+
+    def get_odds_cache_stats(self):
+        return self.odds_cache.stats()
+
+    def get_odds_matrix(self, assignments=None):
+        # Odds for every assignment on every calendar day from the earliest open date
+        # to the latest due date, one row per assignment. Days outside an assignment's
+        # window are NaN so plots leave them blank.
+        assignments = self.assignments if assignments is None else assignments
+        if not assignments:
+            return [], []
+        first_day = min(a.open_date for a in assignments).toordinal()
+        last_day = max(a.due_date for a in assignments).toordinal()
+        dates = [datetime.fromordinal(day) for day in range(first_day, last_day + 1)]
+
+        matrix = []
+        for assignment in assignments:
+            row = [float('nan')] * len(dates)
+            window = self._calendar_days(assignment)
+            offset = assignment.open_date.toordinal() - first_day
+            totals = assignment.ledger.totals_at(date.toordinal() for date in window)
+            for i, (date, total) in enumerate(zip(window, totals)):
+                row[offset + i] = self._odds(assignment, date, total)
+            matrix.append(row)
+        return dates, matrix
 
     def get_detailed_statistics(self):
         stats = {
             "total_users": len(self.users),
             "total_assignments": len(self.assignments),
-            "total_bets": sum(len(user.bets) for user in self.users),
-            "total_bet_amount": sum(bet.amount for user in self.users for bet in user.bets),
-            "average_bet_amount": sum(bet.amount for user in self.users for bet in user.bets) / sum(len(user.bets) for user in self.users) if sum(len(user.bets) for user in self.users) > 0 else 0,
-            "completed_bets": sum(1 for user in self.users for bet in user.bets if bet.completed),
-            "completion_rate": sum(1 for user in self.users for bet in user.bets if bet.completed) / sum(len(user.bets) for user in self.users) if sum(len(user.bets) for user in self.users) > 0 else 0,
+            "total_bets": self.total_bets,
+            "total_bet_amount": self.total_bet_amount,
+            "average_bet_amount": self.total_bet_amount / self.total_bets if self.total_bets > 0 else 0,
+            "completed_bets": self.completed_bets,
+            "completion_rate": self.completed_bets / self.total_bets if self.total_bets > 0 else 0,
             "house_take_percentage": self.house_take * 100
         }
         return stats
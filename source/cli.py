@@ -0,0 +1,136 @@
+from datetime import datetime
+import argparse
+import json
+import logging
+import os
+import sys
+
+from source.metrics import Metrics
+from source.sweep import DEFAULTS, make_engine
+
+# Headless entry point: `python -m source sim ...` or `python -m source serve ...`.
+# Only the simulation engine is imported, never tkinter or matplotlib, so batch
+# jobs start quickly.
+
+def simulate(args):
+    procrast = make_engine(args.engine, args.seed)
+    if args.metrics:
+        procrast.metrics = Metrics()
+    procrast.current_date = args.start
+    procrast.house_take = args.house_take
+    procrast.generate_random_data(args.users, args.assignments, args.min_balance, args.max_balance,
+                                  args.min_duration, args.max_duration)
+    for _ in range(args.days):
+        procrast.simulate_day(args.completion_rate_mean, args.completion_rate_std)
+    house_take, remaining_pool = procrast.finalize_simulation()
+
+    result = {
+        "params": {
+            "engine": args.engine,
+            "seed": args.seed,
+            "start": args.start.isoformat(),
+            "users": args.users,
+            "assignments": args.assignments,
+            "days": args.days,
+            "completion_rate_mean": args.completion_rate_mean,
+            "completion_rate_std": args.completion_rate_std,
+            "house_take": args.house_take,
+        },
+        "house_take": house_take,
+        "remaining_pool": remaining_pool,
+        "statistics": procrast.get_detailed_statistics(),
+        "daily_stats": [{**stat, "date": stat["date"].isoformat()} for stat in procrast.get_daily_stats()],
+    }
+    if procrast.metrics is not None:
+        result["metrics"] = procrast.metrics.to_dict()
+    if args.export:
+        from source.export import export_run
+        result["export"] = export_run(procrast, args.export, args.export_format)
+    return result
+
+def serve(args):
+    import asyncio
+    from source.algo import Procrast
+    from source.service import serve
+    from source.storage import checkpoint, open_book
+
+    if args.snapshot:
+        procrast = open_book(args.snapshot, args.journal or args.snapshot + ".journal", args.seed)
+    else:
+        procrast = Procrast(args.seed)
+    if not procrast.users:
+        # The generated book is saved whole by the checkpoint below, so its
+        # bets are not journaled one by one
+        journal, procrast.journal = procrast.journal, None
+        procrast.generate_random_data(args.users, args.assignments, DEFAULTS["min_balance"], DEFAULTS["max_balance"],
+                                      DEFAULTS["min_duration"], DEFAULTS["max_duration"])
+        procrast.journal = journal
+        if args.snapshot:
+            # Users and assignments only persist through snapshots
+            checkpoint(procrast, args.snapshot)
+    print(f"Serving {len(procrast.users)} users and {len(procrast.assignments)} assignments "
+          f"on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(serve(procrast, args.host, args.port, args.max_batch, args.max_staleness))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if procrast.journal is not None:
+            procrast.journal.close()
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m source", description="Headless Procrast simulations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sim = commands.add_parser("sim", help="run one simulation and write its statistics as JSON")
+    sim.add_argument("--users", type=int, default=DEFAULTS["num_users"])
+    sim.add_argument("--assignments", type=int, default=DEFAULTS["num_assignments"])
+    sim.add_argument("--days", type=int, default=DEFAULTS["days"])
+    sim.add_argument("--seed", help="seed for a reproducible run (random if omitted)")
+    sim.add_argument("--start", type=datetime.fromisoformat, default=datetime.combine(datetime.now().date(), datetime.min.time()),
+                     help="first simulated day, e.g. 2024-01-01 (default: today)")
+    sim.add_argument("--engine", choices=["python", "numpy"], default="python")
+    sim.add_argument("--min-balance", type=float, default=DEFAULTS["min_balance"])
+    sim.add_argument("--max-balance", type=float, default=DEFAULTS["max_balance"])
+    sim.add_argument("--min-duration", type=int, default=DEFAULTS["min_duration"])
+    sim.add_argument("--max-duration", type=int, default=DEFAULTS["max_duration"])
+    sim.add_argument("--completion-rate-mean", type=float, default=DEFAULTS["completion_rate_mean"])
+    sim.add_argument("--completion-rate-std", type=float, default=DEFAULTS["completion_rate_std"])
+    sim.add_argument("--house-take", type=float, default=DEFAULTS["house_take"], help="fraction, e.g. 0.05")
+    sim.add_argument("--metrics", action="store_true", help="include per-operation counters and latencies")
+    sim.add_argument("--out", help="write JSON here instead of stdout")
+    sim.add_argument("--export", metavar="DIR",
+                     help="also write users, bets, assignments and daily stats as columnar files (needs pyarrow)")
+    sim.add_argument("--export-format", choices=["parquet", "arrow"], default="parquet")
+
+    srv = commands.add_parser("serve", help="serve bets, odds and stats over a local HTTP API")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8000)
+    srv.add_argument("--snapshot", help="SQLite snapshot to load; bets are journaled next to it")
+    srv.add_argument("--journal", help="bet journal path (default: <snapshot>.journal)")
+    srv.add_argument("--users", type=int, default=DEFAULTS["num_users"], help="users to generate for an empty book")
+    srv.add_argument("--assignments", type=int, default=DEFAULTS["num_assignments"],
+                     help="assignments to generate for an empty book")
+    srv.add_argument("--seed", help="seed for generated data")
+    srv.add_argument("--max-batch", type=int, default=1_000, help="most bets applied per writer batch")
+    srv.add_argument("--max-staleness", type=float, default=0.25,
+                     help="seconds odds reads may lag behind accepted bets")
+    return parser
+
+def main(argv=None):
+    # Rejected bets are logged as warnings, which would swamp a batch run's stderr
+    logging.basicConfig(level=os.environ.get("PROCRAST_LOG_LEVEL", "ERROR"),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        serve(args)
+        return 0
+
+    result = simulate(args)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
@@ -0,0 +1,230 @@
+from array import array
+from datetime import date
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+# Columnar export of a run for pandas/polars/duckdb. Four tables, one file each:
+#
+#   users        index, name, balance, staked, won, bets
+#   bets         user, amount, day, assignments, completed, potential_return
+#   assignments  index, id, name, open_date, due_date, bets, staked, completed_bets, settled
+#   daily_stats  date, completion_rate, total_bets, completed_bets
+#
+# Files are Parquet (.parquet) or Arrow IPC (.arrow) and are written one record
+# batch of `chunk_size` rows at a time, so a million-bet book never exists as one
+# table. Numeric columns are filled into typed arrays (or sliced from the numpy
+# engine's arrays) and handed to Arrow as buffers without another copy. pyarrow is
+# only imported here.
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+EPOCH = date(1970, 1, 1).toordinal()  # date32 counts days from here
+
+def export_run(procrast, directory, format="parquet", chunk_size=65_536):
+    # Write every table of `procrast` under `directory`; returns {table: path}
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format: {format!r}")
+    import pyarrow as pa
+
+    os.makedirs(directory, exist_ok=True)
+    columnar = hasattr(procrast, "bet_amount")  # vector.VectorProcrast
+    paths = {}
+    for table, build in (("users", _users), ("bets", _bets), ("assignments", _assignments),
+                         ("daily_stats", _daily_stats)):
+        schema, batches = build(pa, procrast, chunk_size, columnar)
+        paths[table] = os.path.join(directory, table + FORMATS[format])
+        rows = _write(pa, paths[table], format, schema, batches)
+        logger.info("Exported %d %s rows to %s", rows, table, paths[table])
+    return paths
+
+def _write(pa, path, format, schema, batches):
+    rows = 0
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                writer.write_table(pa.Table.from_batches([batch], schema))
+                rows += batch.num_rows
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+def _fixed(pa, type, values, validity=None):
+    # Arrow array over a buffer-protocol column (array.array or numpy), no copy
+    return pa.Array.from_buffers(type, len(values), [None if validity is None else pa.py_buffer(validity),
+                                                     pa.py_buffer(values)])
+
+def _bits(flags):
+    # Arrow's LSB-first bitmap for an iterable of truthy values
+    if hasattr(flags, "dtype"):
+        import numpy as np
+        return np.packbits(flags, bitorder="little")
+    bitmap = bytearray()
+    for i, flag in enumerate(flags):
+        if not i & 7:
+            bitmap.append(0)
+        if flag:
+            bitmap[-1] |= 1 << (i & 7)
+    return bitmap
+
+def _bools(pa, flags):
+    if not hasattr(flags, "dtype"):
+        flags = list(flags)
+    return pa.Array.from_buffers(pa.bool_(), len(flags), [None, pa.py_buffer(_bits(flags))])
+
+def _optional(pa, values):
+    # Float column where NaN stands for a missing value
+    if hasattr(values, "dtype"):
+        import numpy as np
+        return _fixed(pa, pa.float64(), values, _bits(~np.isnan(values)))
+    return _fixed(pa, pa.float64(), values, _bits(not math.isnan(v) for v in values))
+
+def _chunks(size, chunk_size):
+    for lo in range(0, size, chunk_size):
+        yield lo, min(lo + chunk_size, size)
+
+def _users(pa, procrast, chunk_size, columnar):
+    schema = pa.schema([("index", pa.int64()), ("name", pa.string()), ("balance", pa.float64()),
+                        ("staked", pa.float64()), ("won", pa.float64()), ("bets", pa.int64())])
+
+    def batches():
+        if columnar:
+            import numpy as np
+            n = len(procrast.user_names)
+            staked = np.bincount(procrast.bet_user, weights=procrast.bet_amount, minlength=n)
+            counts = np.bincount(procrast.bet_user, minlength=n).astype(np.int64)
+            for lo, hi in _chunks(n, chunk_size):
+                # The numpy engine does not keep payouts apart from balances
+                yield pa.RecordBatch.from_arrays([
+                    _fixed(pa, pa.int64(), np.arange(lo, hi, dtype=np.int64)),
+                    pa.array(procrast.user_names[lo:hi], pa.string()),
+                    _fixed(pa, pa.float64(), procrast.user_balance[lo:hi]),
+                    _fixed(pa, pa.float64(), staked[lo:hi]),
+                    pa.nulls(hi - lo, pa.float64()),
+                    _fixed(pa, pa.int64(), counts[lo:hi]),
+                ], schema=schema)
+            return
+        users = procrast.users
+        for lo, hi in _chunks(len(users), chunk_size):
+            chunk = users[lo:hi]
+            yield pa.RecordBatch.from_arrays([
+                _fixed(pa, pa.int64(), array('q', range(lo, hi))),
+                pa.array([user.name for user in chunk], pa.string()),
+                _fixed(pa, pa.float64(), array('d', (user.balance for user in chunk))),
+                _fixed(pa, pa.float64(), array('d', (user.staked for user in chunk))),
+                _fixed(pa, pa.float64(), array('d', (user.won for user in chunk))),
+                _fixed(pa, pa.int64(), array('q', (len(user.bets) for user in chunk))),
+            ], schema=schema)
+    return schema, batches()
+
+def _bets(pa, procrast, chunk_size, columnar):
+    schema = pa.schema([("user", pa.int64()), ("amount", pa.float64()), ("day", pa.date32()),
+                        ("assignments", pa.list_(pa.int32())), ("completed", pa.bool_()),
+                        ("potential_return", pa.float64())])
+
+    def batch(user_ids, amounts, days, offsets, legs, completed, returns):
+        return pa.RecordBatch.from_arrays([
+            _fixed(pa, pa.int64(), user_ids),
+            _fixed(pa, pa.float64(), amounts),
+            _fixed(pa, pa.date32(), days),
+            pa.ListArray.from_arrays(_fixed(pa, pa.int32(), offsets), _fixed(pa, pa.int32(), legs)),
+            _bools(pa, completed),
+            _optional(pa, returns),
+        ], schema=schema)
+
+    def batches():
+        if columnar:
+            import numpy as np
+            for lo, hi in _chunks(procrast.bet_amount.size, chunk_size):
+                # One assignment per bet in the numpy engine
+                yield batch(procrast.bet_user[lo:hi], procrast.bet_amount[lo:hi],
+                            (procrast.bet_day[lo:hi] - EPOCH).astype(np.int32),
+                            np.arange(hi - lo + 1, dtype=np.int32),
+                            procrast.bet_assignment[lo:hi].astype(np.int32),
+                            procrast.bet_completed[lo:hi], procrast.bet_return[lo:hi])
+            return
+        columns = None
+        for user in procrast.users:
+            for bet in user.bets:
+                if columns is None:
+                    columns = (array('q'), array('d'), array('i'), array('i', [0]), array('i'), [], array('d'))
+                    user_ids, amounts, days, offsets, legs, completed, returns = columns
+                user_ids.append(user.index)
+                amounts.append(bet.amount)
+                days.append(bet.day - EPOCH)
+                legs.extend(bet.assignment_ids)
+                offsets.append(len(legs))
+                completed.append(bet.completed)
+                returns.append(math.nan if bet.potential_return is None else bet.potential_return)
+                if len(amounts) == chunk_size:
+                    yield batch(*columns)
+                    columns = None
+        if columns is not None:
+            yield batch(*columns)
+    return schema, batches()
+
+def _assignments(pa, procrast, chunk_size, columnar):
+    schema = pa.schema([("index", pa.int64()), ("id", pa.string()), ("name", pa.string()),
+                        ("open_date", pa.date32()), ("due_date", pa.date32()), ("bets", pa.int64()),
+                        ("staked", pa.float64()), ("completed_bets", pa.int64()), ("settled", pa.bool_())])
+    # Assignments due before the current day have been through settlement
+    today = procrast.current_date.toordinal()
+
+    def batch(lo, hi, ids, names, opens, dues, bets, staked, completed):
+        return pa.RecordBatch.from_arrays([
+            _fixed(pa, pa.int64(), array('q', range(lo, hi))),
+            pa.array(ids, pa.string()),
+            pa.array(names, pa.string()),
+            _fixed(pa, pa.date32(), opens),
+            _fixed(pa, pa.date32(), dues),
+            _fixed(pa, pa.int64(), bets),
+            _fixed(pa, pa.float64(), staked),
+            _fixed(pa, pa.int64(), completed),
+            _bools(pa, [due + EPOCH < today for due in dues]),
+        ], schema=schema)
+
+    def batches():
+        if columnar:
+            import numpy as np
+            n = len(procrast.assignment_names)
+            bets = np.bincount(procrast.bet_assignment, minlength=n).astype(np.int64)
+            staked = np.bincount(procrast.bet_assignment, weights=procrast.bet_amount, minlength=n)
+            completed = np.bincount(procrast.bet_assignment, weights=procrast.bet_completed,
+                                    minlength=n).astype(np.int64)
+            for lo, hi in _chunks(n, chunk_size):
+                yield batch(lo, hi, procrast.assignment_ids[lo:hi], procrast.assignment_names[lo:hi],
+                            (procrast.assignment_open[lo:hi] - EPOCH).astype(np.int32),
+                            (procrast.assignment_due[lo:hi] - EPOCH).astype(np.int32),
+                            bets[lo:hi], staked[lo:hi], completed[lo:hi])
+            return
+        assignments = procrast.assignments
+        for lo, hi in _chunks(len(assignments), chunk_size):
+            chunk = assignments[lo:hi]
+            yield batch(lo, hi, [a.id for a in chunk], [a.name for a in chunk],
+                        array('i', (a.open_date.toordinal() - EPOCH for a in chunk)),
+                        array('i', (a.due_date.toordinal() - EPOCH for a in chunk)),
+                        array('q', (len(a.bets) for a in chunk)),
+                        array('d', (a.ledger.total() for a in chunk)),
+                        array('q', (sum(bet.completed for bet in a.bets) for a in chunk)))
+    return schema, batches()
+
+def _daily_stats(pa, procrast, chunk_size, columnar):
+    schema = pa.schema([("date", pa.timestamp("us")), ("completion_rate", pa.float64()),
+                        ("total_bets", pa.int64()), ("completed_bets", pa.int64())])
+
+    def batches():
+        stats = procrast.get_daily_stats()
+        for lo, hi in _chunks(len(stats), chunk_size):
+            chunk = stats[lo:hi]
+            yield pa.RecordBatch.from_arrays([
+                pa.array([row['date'] for row in chunk], pa.timestamp("us")),
+                _fixed(pa, pa.float64(), array('d', (row['completion_rate'] for row in chunk))),
+                _fixed(pa, pa.int64(), array('q', (row['total_bets'] for row in chunk))),
+                _fixed(pa, pa.int64(), array('q', (row['completed_bets'] for row in chunk))),
+            ], schema=schema)
+    return schema, batches()
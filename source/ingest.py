@@ -0,0 +1,57 @@
+import csv
+import json
+from datetime import date
+
+# Record sources for Procrast.place_bets. Each yields (user index, amount,
+# day ordinal, assignment indexes) tuples lazily, so files and queues of any
+# size stream through in chunks.
+#
+# JSONL: {"user": 3, "amount": 25.0, "date": "2024-03-01", "assignments": [7]}
+#        ("day" may be given as an ordinal instead of "date")
+# CSV:   user,amount,date,assignments   with assignments separated by ";"
+
+# Yielded for a line that cannot be parsed; place_bets reports it as INVALID_BET
+INVALID_RECORD = (None, None, None, ())
+
+def _day(row):
+    if "day" in row and row["day"] not in (None, ""):
+        return int(row["day"])
+    return date.fromisoformat(row["date"][:10]).toordinal()
+
+def _jsonl_record(line):
+    row = json.loads(line)
+    return int(row["user"]), float(row["amount"]), _day(row), tuple(int(a) for a in row["assignments"])
+
+def _csv_record(row):
+    ids = tuple(int(a) for a in row["assignments"].split(";") if a)
+    return int(row["user"]), float(row["amount"]), _day(row), ids
+
+def _parse(parse, raw):
+    # One malformed line must not stop the rest of the file from being ingested
+    try:
+        return parse(raw)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return INVALID_RECORD
+
+def read_jsonl(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield _parse(_jsonl_record, line)
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield _parse(_csv_record, row)
+
+def read_queue(q, sentinel=None):
+    # Blocks on the queue until `sentinel` arrives
+    while True:
+        record = q.get()
+        if record is sentinel:
+            return
+        yield record
+
+def ingest_file(procrast, path, chunk_size=10_000):
+    records = read_csv(path) if path.endswith(".csv") else read_jsonl(path)
+    return procrast.place_bets(records, chunk_size)
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+import cProfile
+import functools
+import json
+import pstats
+
+# Opt-in instrumentation for Procrast. Nothing is recorded unless a Metrics
+# instance is attached as `procrast.metrics`; with none attached an instrumented
+# method costs one attribute check.
+
+class Histogram:
+    # Latencies bucketed by powers of two of microseconds: bucket k holds
+    # durations in [2^(k-1), 2^k) us, bucket 0 everything under 1 us
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = defaultdict(int)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[int(seconds * 1e6).bit_length()] += 1
+
+    def percentile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min((2 ** bucket) / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "min_s": self.min if self.count else 0.0,
+            "max_s": self.max,
+            "p50_s": self.percentile(0.5),
+            "p99_s": self.percentile(0.99),
+            "buckets_us": {str(2 ** bucket if bucket else 0): n for bucket, n in sorted(self.buckets.items())},
+        }
+
+class Metrics:
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.histograms = defaultdict(Histogram)
+
+    def incr(self, name, n=1):
+        self.counters[name] += n
+
+    def observe(self, name, seconds):
+        self.histograms[name].observe(seconds)
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def to_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "latency": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+        }
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def instrumented(name):
+    # Times a Procrast method into `self.metrics` when metrics are attached
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.observe(name, perf_counter() - start)
+        return wrapper
+    return decorate
+
+@contextmanager
+def profile_run(path=None, sort="cumulative"):
+    # cProfile everything inside the block; stats are written to `path` (a
+    # .prof file readable with pstats/snakeviz) when one is given
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path is not None:
+            pstats.Stats(profiler).sort_stats(sort).dump_stats(path)
@@ -0,0 +1,99 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import count
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Discrete-event driver for Procrast. Instead of calling simulate_day for every
+# calendar day, the scheduler keeps a priority queue of events (bets to place,
+# days on which assignments settle, the payout) and jumps straight from one to
+# the next, so a run costs time proportional to its events.
+#
+# Settlement stays daily: a day with assignments due settles once, after every
+# other event that falls on that day, through Procrast.settle_day. The rows it
+# produces are the ones simulate_day would have, and days where nothing settles
+# are left for Procrast.daily_stats to fill in lazily. Bet and payout times are
+# floored to their day: bets carry only a day, so a finer time could not change
+# which bets a settlement sees.
+
+DAY = timedelta(days=1)
+
+# Ordering of events at the same time
+BET, SETTLE, PAYOUT = range(3)
+
+class Scheduler:
+    def __init__(self, procrast, completion_rate_mean=0.7, completion_rate_std=0.1):
+        self.procrast = procrast
+        self.completion_rate_mean = completion_rate_mean
+        self.completion_rate_std = completion_rate_std
+        self.payout = None  # (house take, remaining pool) once the payout event has run
+        self._events = []  # heap of (time, kind, seq, payload)
+        self._seq = count()
+        self._settle_days = set()  # day ordinals with a queued SETTLE event
+
+    def _slot(self, when):
+        # Floor a datetime to its day
+        return datetime.fromordinal(when.toordinal())
+
+    def _push(self, when, kind, payload=None):
+        heapq.heappush(self._events, (when, kind, next(self._seq), payload))
+
+    def schedule_bet(self, when, user, amount, selected_date, assignments):
+        self._push(self._slot(when), BET, (user, amount, selected_date, assignments))
+
+    def schedule_payout(self, when):
+        self._push(self._slot(when), PAYOUT)
+
+    def _schedule_settlements(self, end_day):
+        # One SETTLE event per day from today up to end_day that has assignments due
+        today = self.procrast.current_date.toordinal()
+        due_days = self.procrast.due_days
+        for i in range(bisect_left(due_days, today), bisect_left(due_days, end_day)):
+            day = due_days[i]
+            if day not in self._settle_days:
+                self._settle_days.add(day)
+                # SETTLE orders after BET, so the day's bets are in before it settles
+                self._push(datetime.fromordinal(day), SETTLE, day)
+
+    def events(self, until):
+        # Run every event before `until`, yielding (time, kind, result) after each.
+        # On completion current_date has advanced to the same time of day on
+        # `until`'s date as a run of simulate_day calls would have left it.
+        procrast = self.procrast
+        start = procrast.current_date
+        end_day = until.toordinal()
+        self._schedule_settlements(end_day)
+        daily_stats = procrast.daily_stats
+        time_of_day = start - datetime.fromordinal(start.toordinal())
+        skipped_from = start  # first day not yet in daily_stats
+
+        while self._events and self._events[0][0] < datetime.fromordinal(end_day):
+            when, kind, _, payload = heapq.heappop(self._events)
+            # Jump straight to the event's day, keeping the run's time of day
+            if when.toordinal() > procrast.current_date.toordinal():
+                procrast.current_date = datetime.fromordinal(when.toordinal()) + time_of_day
+            if kind == BET:
+                result = procrast.place_bet(*payload)
+            elif kind == SETTLE:
+                self._settle_days.discard(payload)
+                daily_stats.cover(skipped_from, payload, self.completion_rate_mean, self.completion_rate_std)
+                result = procrast.settle_day(procrast.current_date, self.completion_rate_mean,
+                                             self.completion_rate_std)
+                daily_stats.append(result)
+                skipped_from = procrast.current_date + DAY
+            else:
+                result = self.payout = procrast.finalize_simulation()
+            yield when, kind, result
+
+        daily_stats.cover(skipped_from, end_day, self.completion_rate_mean, self.completion_rate_std)
+        procrast.current_date = datetime.fromordinal(end_day) + time_of_day
+        logger.info("Scheduled run reached %s", procrast.current_date)
+
+    def run(self, until):
+        # Returns the number of events processed
+        return sum(1 for _ in self.events(until))
+
+    def run_days(self, days):
+        return self.run(self.procrast.current_date + timedelta(days=days))
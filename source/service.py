@@ -0,0 +1,214 @@
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import json
+import logging
+import math
+
+from source.algo import ACCEPTED, INSUFFICIENT_BALANCE, UNKNOWN_USER, UNKNOWN_ASSIGNMENT, INVALID_BET
+
+logger = logging.getLogger(__name__)
+
+# Local HTTP/JSON API around a Procrast book, standard library only.
+#
+#   POST /bets      {"user": 3, "amount": 25.0, "date": "2024-03-01", "assignments": [7]}
+#   GET  /odds      ?assignment=7[&date=2024-03-01]   (date defaults to the book's current day)
+#   GET  /calendar  ?assignment=7
+#   GET  /stats
+#
+# Users and assignments are addressed by index, as in source.ingest; a bet's
+# "user" may also be given by name. Bets are
+# queued to a single writer task that applies everything waiting as one
+# place_bets batch and flushes the journal once per batch. Odds reads are served
+# from the book's immutable OddsSnapshot, republished when it is missing bets and
+# older than `max_staleness` seconds, so reads never wait on the writer.
+
+BET_STATUS = {
+    ACCEPTED: (201, "accepted"),
+    INSUFFICIENT_BALANCE: (409, "insufficient balance"),
+    UNKNOWN_USER: (404, "unknown user"),
+    UNKNOWN_ASSIGNMENT: (404, "unknown assignment"),
+    INVALID_BET: (400, "invalid bet"),
+}
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 500: "Internal Server Error"}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class BettingService:
+    def __init__(self, procrast, max_batch=1_000, max_staleness=0.25):
+        self.procrast = procrast
+        self.max_batch = max_batch
+        self.max_staleness = max_staleness
+        self._bets = asyncio.Queue()
+        self._writer = None
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8000):
+        self._writer = asyncio.create_task(self._write_bets())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._writer.cancel()
+        if self.procrast.journal is not None:
+            self.procrast.journal.flush()
+
+    async def _write_bets(self):
+        while True:
+            batch = [await self._bets.get()]
+            while len(batch) < self.max_batch and not self._bets.empty():
+                batch.append(self._bets.get_nowait())
+            try:
+                statuses = self.procrast.place_bets([record for record, _ in batch])
+                if self.procrast.journal is not None:
+                    self.procrast.journal.flush()
+            except Exception as e:
+                logger.exception("Bet batch failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), status in zip(batch, statuses):
+                if not future.done():
+                    future.set_result(status)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                try:
+                    method, target, version, headers = _parse_head(head)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # The stream can't be trusted past a bad head, so answer and hang up
+                    await _respond(writer, 400, {"error": "malformed request"}, keep_alive=False)
+                    return
+                body = await reader.readexactly(length)
+
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception:
+                    logger.exception("Request failed: %s %s", method, target)
+                    status, payload = 500, {"error": "internal error"}
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await _respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if url.path == "/bets":
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            return await self.place_bet(body)
+        if method != "GET":
+            raise HTTPError(405, "use GET")
+        if url.path == "/odds":
+            return 200, self.odds(query)
+        if url.path == "/calendar":
+            return 200, self.calendar(query)
+        if url.path == "/stats":
+            return 200, self.procrast.get_detailed_statistics()
+        raise HTTPError(404, f"no route for {url.path}")
+
+    async def place_bet(self, body):
+        try:
+            bet = json.loads(body)
+            day = _day(bet.get("date")) if "date" in bet else self.procrast.current_date.toordinal()
+            user = bet["user"]
+            record = (user if isinstance(user, str) else int(user), float(bet["amount"]), day,
+                      tuple(int(a) for a in bet["assignments"]))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise HTTPError(400, f"invalid bet: {e!r}")
+        if not math.isfinite(record[1]) or record[1] <= 0:
+            raise HTTPError(400, "amount must be a positive number")
+        if isinstance(record[0], str):
+            user = self.procrast.get_user(record[0])
+            if user is None:
+                raise HTTPError(404, "unknown user")
+            record = (user.index,) + record[1:]
+        future = asyncio.get_running_loop().create_future()
+        await self._bets.put((record, future))
+        status, message = BET_STATUS[await future]
+        return status, {"status": message}
+
+    def odds(self, query):
+        index = self._assignment(query)
+        day = _day(query["date"]) if "date" in query else self.procrast.current_date.toordinal()
+        snapshot = self.procrast.get_odds_snapshot(self.max_staleness)
+        odds = snapshot.odds(index, day)
+        if odds is None:
+            raise HTTPError(400, "date outside the assignment's window")
+        return {"assignment": index, "date": date.fromordinal(day).isoformat(), "odds": odds,
+                "version": snapshot.version}
+
+    def calendar(self, query):
+        index = self._assignment(query)
+        snapshot = self.procrast.get_odds_snapshot(self.max_staleness)
+        if index >= len(snapshot.rows):
+            snapshot = self.procrast.publish_odds()
+        first_day, odds = snapshot.rows[index]
+        return {"assignment": index, "version": snapshot.version,
+                "odds": {date.fromordinal(first_day + i).isoformat(): value for i, value in enumerate(odds)}}
+
+    def _assignment(self, query):
+        if "assignment" not in query:
+            raise HTTPError(400, "assignment is required")
+        try:
+            index = int(query["assignment"])
+        except ValueError:
+            raise HTTPError(400, "assignment must be an index")
+        if not 0 <= index < len(self.procrast.assignments):
+            raise HTTPError(404, "unknown assignment")
+        return index
+
+def _parse_head(head):
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    method, target, version = request_line.split(" ", 2)
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+async def _respond(writer, status, payload, keep_alive):
+    data = json.dumps(payload).encode()
+    writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n"
+                 % (status, REASONS[status].encode(), len(data), b"" if keep_alive else b"Connection: close\r\n")
+                 + data)
+    await writer.drain()
+
+def _day(value):
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        raise HTTPError(400, f"invalid date: {value!r}")
+
+async def serve(procrast, host="127.0.0.1", port=8000, max_batch=1_000, max_staleness=0.25):
+    service = BettingService(procrast, max_batch, max_staleness)
+    server = await service.start(host, port)
+    logger.info("Serving on %s", ", ".join(str(sock.getsockname()) for sock in server.sockets))
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
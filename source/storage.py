@@ -0,0 +1,209 @@
+from collections import defaultdict
+from datetime import datetime
+import gc
+import json
+import logging
+import os
+import sqlite3
+
+from source.algo import Procrast, User, Assignment, Bet
+
+logger = logging.getLogger(__name__)
+
+# Durable state for a Procrast book: a SQLite snapshot of users, assignments,
+# bets and run state, plus an append-only journal of accepted bets placed since
+# the snapshot. Loading bulk-reads the snapshot and replays only the journal
+# records newer than it. Users and assignments are captured by snapshots only,
+# so take one after adding them.
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE users (idx INTEGER PRIMARY KEY, name TEXT, balance REAL, staked REAL, won REAL);
+CREATE TABLE assignments (idx INTEGER PRIMARY KEY, id TEXT, name TEXT, open_date TEXT, due_date TEXT);
+CREATE TABLE bets (idx INTEGER PRIMARY KEY, user INTEGER, amount REAL, day INTEGER, assignments TEXT,
+                   completed INTEGER, potential_return REAL);
+CREATE TABLE daily_stats (date TEXT, completion_rate REAL, total_bets INTEGER, completed_bets INTEGER);
+"""
+
+class BetJournal:
+    # JSON lines of [seq, user index, amount, day ordinal, [assignment indexes]].
+    # Records are buffered and written every `flush_every` bets (and on flush/close),
+    # so a crash loses at most that unflushed tail. A torn last line is dropped
+    # when the journal is reopened.
+    def __init__(self, path, flush_every=64, fsync=False):
+        self.path = path
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.seq = 0
+        self._pending = []
+
+        valid_end = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        self.seq = json.loads(line)[0]
+                    except ValueError:
+                        break
+                    valid_end += len(line)
+        self._file = open(path, "ab")
+        self._file.truncate(valid_end)
+
+    def record(self, user, amount, day, assignment_ids):
+        self.seq += 1
+        self._pending.append(json.dumps([self.seq, user, amount, day, list(assignment_ids)]))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write(("\n".join(self._pending) + "\n").encode())
+            self._pending = []
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def records(self, after=0):
+        self.flush()
+        with open(self.path, "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                if record[0] > after:
+                    yield record
+
+    def truncate(self):
+        # Everything so far is in a snapshot; sequence numbers keep counting
+        self._pending = []
+        self._file.truncate(0)
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+def save_snapshot(procrast, path, journal_seq=0):
+    # Written to a temporary file and renamed, so a crash never leaves a partial snapshot
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        meta = {
+            "current_date": procrast.current_date.isoformat(),
+            "house_take": procrast.house_take,
+            "total_paid": procrast.total_paid,
+            "random_streams": procrast.streams.getstate(),
+            "generations": procrast.generations,
+            "daily_rollups": procrast.daily_stats.getstate(),
+            "journal_seq": journal_seq,
+        }
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", ((k, json.dumps(v)) for k, v in meta.items()))
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)",
+                         ((u.index, u.name, u.balance, u.staked, u.won) for u in procrast.users))
+        conn.executemany("INSERT INTO assignments VALUES (?, ?, ?, ?, ?)",
+                         ((a.index, a.id, a.name, a.open_date.isoformat(), a.due_date.isoformat())
+                          for a in procrast.assignments))
+        bets = (bet for user in procrast.users for bet in user.bets)
+        conn.executemany("INSERT INTO bets (user, amount, day, assignments, completed, potential_return) "
+                         "VALUES (?, ?, ?, ?, ?, ?)",
+                         ((bet.user.index, bet.amount, bet.day, ",".join(map(str, bet.assignment_ids)),
+                           int(bet.completed), bet.potential_return) for bet in bets))
+        conn.executemany("INSERT INTO daily_stats VALUES (?, ?, ?, ?)",
+                         ((stat['date'].isoformat(), stat['completion_rate'], stat['total_bets'],
+                           stat['completed_bets']) for stat in procrast.daily_stats))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+def load_snapshot(path):
+    conn = sqlite3.connect(path)
+    # Millions of fresh objects would otherwise trigger a cyclic GC pass every
+    # few hundred allocations; nothing built here forms a garbage cycle
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        meta = {k: json.loads(v) for k, v in conn.execute("SELECT key, value FROM meta")}
+        procrast = Procrast()
+        procrast.current_date = datetime.fromisoformat(meta["current_date"])
+        procrast.house_take = meta["house_take"]
+        procrast.streams.setstate(meta["random_streams"])
+        procrast.generations = meta["generations"]
+        procrast.daily_stats.setstate(meta["daily_rollups"])
+
+        for name, balance, staked, won in conn.execute("SELECT name, balance, staked, won FROM users ORDER BY idx"):
+            user = User(name, balance)
+            user.staked = staked
+            user.won = won
+            procrast._index_user(user)
+        for id, name, open_date, due_date in conn.execute(
+                "SELECT id, name, open_date, due_date FROM assignments ORDER BY idx"):
+            procrast._index_assignment(Assignment(id, name, datetime.fromisoformat(open_date),
+                                                  datetime.fromisoformat(due_date)))
+
+        # Bets go straight into the model; ledgers are sorted once per assignment
+        users, assignments = procrast.users, procrast.assignments
+        stakes = defaultdict(lambda: ([], []))  # assignment index -> (days, stake shares)
+        for user_index, amount, day, ids, completed, potential_return in conn.execute(
+                "SELECT user, amount, day, assignments, completed, potential_return FROM bets ORDER BY idx"):
+            ids = tuple(int(i) for i in ids.split(","))
+            user = users[user_index]
+            bet = Bet(user, amount, day, ids)
+            bet.completed = bool(completed)
+            bet.potential_return = potential_return
+            user.bets.append(bet)
+            share = amount / len(ids)
+            for i in ids:
+                assignments[i].bets.append(bet)
+                days, shares = stakes[i]
+                days.append(day)
+                shares.append(share)
+            procrast.total_bets += 1
+            procrast.total_bet_amount += amount
+            procrast.completed_bets += bet.completed
+        for i, (days, shares) in stakes.items():
+            assignments[i].ledger.extend(days, shares)
+        procrast.total_paid = meta["total_paid"]
+
+        procrast.daily_stats.extend(
+            {'date': datetime.fromisoformat(date), 'completion_rate': rate, 'total_bets': total, 'completed_bets': completed}
+            for date, rate, total, completed in conn.execute("SELECT * FROM daily_stats ORDER BY rowid")
+        )
+    finally:
+        conn.close()
+        if gc_was_enabled:
+            gc.enable()
+    return procrast, meta["journal_seq"]
+
+def open_book(snapshot_path, journal_path, seed=None, **journal_options):
+    # Load the snapshot (or start an empty book from `seed`), replay the
+    # journal tail and attach the journal so further bets are recorded
+    if os.path.exists(snapshot_path):
+        procrast, seq = load_snapshot(snapshot_path)
+    else:
+        procrast, seq = Procrast(seed), 0
+    journal = BetJournal(journal_path, **journal_options)
+
+    replayed = 0
+    for _, user, amount, day, ids in journal.records(after=seq):
+        procrast.place_bet(procrast.users[user], amount, datetime.fromordinal(day),
+                           [procrast.assignments[i] for i in ids])
+        replayed += 1
+    journal.seq = max(journal.seq, seq)
+    procrast.journal = journal
+    logger.info("Loaded %d bets, replayed %d from the journal", procrast.total_bets, replayed)
+    return procrast
+
+def checkpoint(procrast, snapshot_path):
+    # Snapshot the book, then drop the journal records it now covers
+    journal = procrast.journal
+    seq = 0
+    if journal is not None:
+        journal.flush()
+        seq = journal.seq
+    save_snapshot(procrast, snapshot_path, seq)
+    if journal is not None:
+        journal.truncate()
@@ -0,0 +1,154 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import logging
+import os
+import random
+import statistics
+
+from source.algo import Procrast
+from source.metrics import Metrics, profile_run
+
+# Headless Monte-Carlo sweeps. Every run gets its own Procrast seeded from the
+# sweep seed, its grid position and its replicate number, so results do not
+# depend on which worker picks the run up or how many workers there are.
+
+SWEEP_PARAMS = ("completion_rate_mean", "completion_rate_std", "house_take")
+METRICS = ("house_take", "remaining_pool", "completed_bets", "completion_rate")
+
+DEFAULTS = {
+    "num_users": 100,
+    "num_assignments": 50,
+    "min_balance": 100,
+    "max_balance": 1000,
+    "min_duration": 1,
+    "max_duration": 30,
+    "days": 30,
+    "completion_rate_mean": 0.7,
+    "completion_rate_std": 0.1,
+    "house_take": 0.05,
+}
+
+# A fresh book for `engine` ("python" or "numpy"), seeded with `seed`. Shared
+# by sweeps and the command line so both seed the numpy engine the same way.
+def make_engine(engine, seed):
+    if engine == "numpy":
+        from source.vector import VectorProcrast
+        # NumPy generators want an integer seed
+        return VectorProcrast(random.Random(seed).getrandbits(64))
+    return Procrast(seed)
+
+def run_once(config):
+    procrast = make_engine(config["engine"], config["seed"])
+    if config.get("metrics"):
+        procrast.metrics = Metrics()
+    if config.get("profile_dir"):
+        with profile_run(os.path.join(config["profile_dir"], f"run-{config['seed'].replace(':', '-')}.prof")):
+            return _simulate(procrast, config)
+    return _simulate(procrast, config)
+
+def _simulate(procrast, config):
+    procrast.house_take = config["house_take"]
+    procrast.generate_random_data(config["num_users"], config["num_assignments"], config["min_balance"],
+                                  config["max_balance"], config["min_duration"], config["max_duration"])
+    for _ in range(config["days"]):
+        procrast.simulate_day(config["completion_rate_mean"], config["completion_rate_std"])
+    return _result(procrast)
+
+def _result(procrast):
+    house_take, remaining_pool = procrast.finalize_simulation()
+    stats = procrast.get_detailed_statistics()
+    result = {
+        "house_take": house_take,
+        "remaining_pool": remaining_pool,
+        "completed_bets": stats["completed_bets"],
+        "completion_rate": stats["completion_rate"],
+    }
+    if procrast.metrics is not None:
+        result["metrics"] = procrast.metrics.to_dict()
+    return result
+
+# "What if" runs off one point of a simulation, e.g. house_take=0.03 from day 60
+# on. Every scenario (a dict of SWEEP_PARAMS overrides) restores the same
+# checkpoint of `procrast`, simulates `days` more days and is finalized, so the
+# population is shared instead of regenerated per scenario. The completion model
+# of the run being branched must be passed in; scenarios only change what they
+# name. Returns one result per scenario, with its params, and leaves the book at
+# the checkpoint.
+def branch(procrast, scenarios, days, completion_rate_mean, completion_rate_std, checkpoint=None):
+    for scenario in scenarios:
+        unknown = set(scenario) - set(SWEEP_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    checkpoint = checkpoint or procrast.checkpoint()
+    results = []
+    for scenario in scenarios:
+        procrast.restore(checkpoint)
+        config = {"completion_rate_mean": completion_rate_mean, "completion_rate_std": completion_rate_std,
+                  "house_take": checkpoint.house_take, **scenario}
+        procrast.house_take = config["house_take"]
+        for _ in range(days):
+            procrast.simulate_day(config["completion_rate_mean"], config["completion_rate_std"])
+        results.append({"params": scenario, **_result(procrast)})
+    procrast.restore(checkpoint)
+    return results
+
+def _quiet_worker():
+    # Per-bet log lines would dominate a worker's runtime
+    logging.disable(logging.WARNING)
+
+def summarize(values):
+    ordered = sorted(values)
+    def pct(q):
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+    return {
+        "mean": statistics.fmean(ordered),
+        "std": statistics.pstdev(ordered),
+        "min": ordered[0],
+        "p05": pct(0.05),
+        "p50": pct(0.5),
+        "p95": pct(0.95),
+        "max": ordered[-1],
+        "values": values,
+    }
+
+def expand_grid(grid):
+    unknown = set(grid) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    names = list(grid)
+    return [dict(zip(names, values)) for values in product(*(grid[name] for name in names))]
+
+# Runs every point of `grid` (a dict mapping SWEEP_PARAMS to lists of values)
+# `replicates` times across a process pool. Other simulation settings from
+# DEFAULTS are passed as keyword arguments. Returns one entry per grid point with
+# its parameters and a distribution summary per metric. `metrics=True` attaches
+# each run's counters/latencies; `profile_dir` writes a cProfile file per run.
+def sweep(grid, replicates=10, seed=0, max_workers=None, engine="python", metrics=False, profile_dir=None,
+          **settings):
+    unknown = set(settings) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown simulation settings: {sorted(unknown)}")
+    base = {**DEFAULTS, **settings, "engine": engine, "metrics": metrics, "profile_dir": profile_dir}
+    points = expand_grid(grid)
+
+    configs = []
+    for i, point in enumerate(points):
+        for r in range(replicates):
+            configs.append({**base, **point, "seed": f"{seed}:{i}:{r}"})
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(configs) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_quiet_worker) as pool:
+        outcomes = list(pool.map(run_once, configs, chunksize=chunksize))
+
+    results = []
+    for i, point in enumerate(points):
+        runs = outcomes[i * replicates:(i + 1) * replicates]
+        results.append({
+            "params": point,
+            "replicates": replicates,
+            "metrics": {metric: summarize([run[metric] for run in runs]) for metric in METRICS},
+        })
+        if metrics:
+            results[-1]["runs"] = [run["metrics"] for run in runs]
+    return results
@@ -2,13 +2,160 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime, timedelta
-from source.algo import Procrast, Assignment, User, Bet
+from source.algo import Procrast, Assignment, User, Bet, NameIndex
+from source.worker import SimulationWorker
+import logging
+import os
+import queue
 import sys
 
+def plotting():
+    # matplotlib is imported on the first chart render rather than at startup
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return Figure, FigureCanvasTkAgg
+
+# Assignments beyond this many are drawn without a legend
+LEGEND_LIMIT = 10
+# Most names offered by a type-ahead dropdown
+SUGGESTION_LIMIT = 50
+
+def downsample(xs, ys, width):
+    # Keep the min and max of each pixel column, in order, so a dense series
+    # draws at most two points per pixel without losing its spikes
+    if width <= 0 or len(xs) <= 2 * width:
+        return xs, ys
+    step = len(xs) / width
+    out_x, out_y = [], []
+    for column in range(width):
+        chunk = range(int(column * step), int((column + 1) * step))
+        low = min(chunk, key=ys.__getitem__)
+        high = max(chunk, key=ys.__getitem__)
+        for i in sorted({low, high}):
+            out_x.append(xs[i])
+            out_y.append(ys[i])
+    return out_x, out_y
+
+class RowSource:
+    # One of the engine's row lists (users or assignments) plus a name index
+    # grown as rows are added and, on engines that keep one, its change feed
+    def __init__(self, controller, rows_attr, feed_attr):
+        self.controller = controller
+        self.rows_attr = rows_attr
+        self.feed_attr = feed_attr
+        self.names = NameIndex()
+        self._procrast = None
+        self._indexed = 0
+        self._cleared = 0
+
+    @property
+    def rows(self):
+        return getattr(self.controller.procrast, self.rows_attr)
+
+    @property
+    def feed(self):
+        return getattr(self.controller.procrast, self.feed_attr, None)
+
+    def sync(self):
+        procrast, rows, feed = self.controller.procrast, self.rows, self.feed
+        cleared = feed.cleared if feed is not None else 0
+        if procrast is not self._procrast or cleared != self._cleared or len(rows) < self._indexed:
+            self.names.clear()
+            self._procrast, self._indexed, self._cleared = procrast, 0, cleared
+        for i in range(self._indexed, len(rows)):
+            self.names.add(rows[i].name, i)
+        self._indexed = len(rows)
+
+    def find(self, name):
+        # Row with exactly this name, via the index rather than a scan
+        self.sync()
+        rows = self.rows
+        for index in self.names.lookup(name):
+            if rows[index].name == name:
+                return rows[index]
+        return None
+
+class VirtualList(ttk.Frame):
+    # Treeview that only ever holds one page of items. Scrolling refills the
+    # same items from the row source, and refresh() rewrites a row only when it
+    # scrolled into view or the source's change feed says it changed. A name
+    # prefix narrows the list through the source's name index.
+    def __init__(self, parent, source, headings, render, page_size=20):
+        super().__init__(parent)
+        self.source = source
+        self.render = render
+        self.page_size = page_size
+        self.prefix = ""
+        self.offset = 0
+        self.total = 0
+        self._shown = [None] * page_size  # row index shown in each item, None if detached
+        self._seen = 0  # feed seq at the last refresh
+
+        columns = [f"c{i}" for i in range(len(headings))]
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=page_size)
+        for column, text in zip(columns, headings):
+            self.tree.heading(column, text=text)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.items = [self.tree.insert("", "end") for _ in range(page_size)]
+        for item in self.items:
+            self.tree.detach(item)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset - int(e.delta / 120) * 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+
+    def set_prefix(self, prefix):
+        self.prefix = prefix
+        self.offset = 0
+        self.refresh()
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.refresh()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        else:
+            self.scroll_to(self.offset + int(amount) * (self.page_size if unit == "pages" else 1))
+
+    def refresh(self):
+        source = self.source
+        source.sync()
+        rows, feed = source.rows, source.feed
+        if self.prefix:
+            lo, hi = source.names.prefix_range(self.prefix)
+            self.total = hi - lo
+            names = source.names
+            row_at = lambda k: names[lo + k]
+        else:
+            self.total = len(rows)
+            row_at = lambda k: k
+        self.offset = max(0, min(self.offset, self.total - self.page_size))
+
+        for slot, item in enumerate(self.items):
+            k = self.offset + slot
+            if k >= self.total:
+                if self._shown[slot] is not None:
+                    self.tree.detach(item)
+                    self._shown[slot] = None
+                continue
+            index = row_at(k)
+            if self._shown[slot] != index or feed is None or feed.changed(index, self._seen):
+                self.tree.item(item, values=self.render(rows[index]))
+                if self._shown[slot] is None:
+                    self.tree.move(item, "", slot)
+                self._shown[slot] = index
+        self._seen = feed.seq if feed is not None else 0
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + self.page_size) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
 def setup_styles(style):
     style.configure("Sidebar.TFrame", background="#F2F2F7")
     style.configure("Main.TFrame", background="white")
@@ -52,6 +199,10 @@ class ProcrastUI(ttk.Window):
         self.title("🎲 Procrast")
         self.geometry("1200x800")
         self.procrast = Procrast()
+        self.engine = "python"
+        self.user_rows = RowSource(self, "users", "user_feed")
+        self.assignment_rows = RowSource(self, "assignments", "assignment_feed")
+        self.book_actions = []  # buttons that touch the book; disabled while a simulation runs
 
         setup_styles(self.style)
 
@@ -92,9 +243,31 @@ class ProcrastUI(ttk.Window):
 
     def show_frame(self, page_name):
         frame = self.frames[page_name]
+        if page_name == "DashboardFrame":
+            frame.refresh()
         frame.tkraise()
         self.sidebar.set_active(page_name)
 
+    def set_book_busy(self, busy):
+        # The simulation worker owns the book until it finishes
+        for button in self.book_actions:
+            button.configure(state="disabled" if busy else "normal")
+
+    def book_available(self):
+        if self.frames['SimulationFrame'].worker is None:
+            return True
+        Messagebox.show_error("Simulation Running", "Wait for the simulation to finish or cancel it first.")
+        return False
+
+    def use_engine(self, engine):
+        # The NumPy engine is optional, so only import it when it is picked
+        if engine == "numpy":
+            from source.vector import VectorProcrast
+            self.procrast = VectorProcrast()
+        else:
+            self.procrast = Procrast()
+        self.engine = engine
+
 class Sidebar(ttk.Frame):
     def __init__(self, parent, width):
         super().__init__(parent, width=width, style='Sidebar.TFrame')
@@ -163,18 +336,13 @@ class DashboardFrame(ttk.Frame):
         stats_frame = ttk.Frame(self, style="Card.TFrame")
         stats_frame.pack(fill="x", pady=10)
 
-        stats = [
-            ("Total Users", len(self.controller.procrast.users)),
-            ("Total Assignments", len(self.controller.procrast.assignments)),
-            ("Total Bets", sum(len(user.bets) for user in self.controller.procrast.users)),
-            ("House Take", f"{self.controller.procrast.house_take:.2%}")
-        ]
-
-        for i, (title, value) in enumerate(stats):
+        self.stat_labels = {}
+        for i, title in enumerate(("Total Users", "Total Assignments", "Total Bets", "House Take")):
             frame = ttk.Frame(stats_frame, style="TFrame")
             frame.grid(row=0, column=i, padx=20, pady=20, sticky="nsew")
             ttk.Label(frame, text=title, font=("SF Pro Text", 14)).grid(row=0, column=0, pady=5)
-            ttk.Label(frame, text=str(value), font=("SF Pro Display", 24, "bold")).grid(row=1, column=0, pady=5)
+            self.stat_labels[title] = ttk.Label(frame, text="", font=("SF Pro Display", 24, "bold"))
+            self.stat_labels[title].grid(row=1, column=0, pady=5)
 
         stats_frame.grid_columnconfigure((0,1,2,3), weight=1)
 
@@ -189,9 +357,23 @@ class DashboardFrame(ttk.Frame):
             width=15
         )
         reset_button.pack(anchor="w", pady=(20, 0))
+        controller.book_actions.append(reset_button)
+
+        self.refresh()
+
+    def refresh(self):
+        # The engine keeps running totals, so this is cheap enough to call live
+        stats = self.controller.procrast.get_detailed_statistics()
+        self.stat_labels["Total Users"].config(text=str(stats["total_users"]))
+        self.stat_labels["Total Assignments"].config(text=str(stats["total_assignments"]))
+        self.stat_labels["Total Bets"].config(text=str(stats["total_bets"]))
+        self.stat_labels["House Take"].config(text=f"{stats['house_take_percentage'] / 100:.2%}")
 
     def reset_simulation(self):
+        if not self.controller.book_available():
+            return
         self.controller.procrast.reset()
+        self.refresh()
         self.controller.frames['AssignmentsFrame'].update_assignment_list()
         self.controller.frames['BettingFrame'].update_user_menu()
         self.controller.frames['BettingFrame'].update_assignment_menu()
@@ -223,22 +405,24 @@ class AssignmentsFrame(ttk.Frame):
             width=15
         )
         add_button.pack(anchor="w", padx=10, pady=20)
+        controller.book_actions.append(add_button)
 
-        tree_frame = ttk.Frame(self)
-        tree_frame.pack(fill="both", expand=True, padx=10, pady=20)
-
-        self.assignment_tree = ttk.Treeview(tree_frame, columns=("name", "due_date"), show="headings")
-        self.assignment_tree.heading("name", text="Assignment Name")
-        self.assignment_tree.heading("due_date", text="Due Date")
-        self.assignment_tree.pack(side="left", fill="both", expand=True)
+        ttk.Label(self, text="Search:").pack(anchor="w", padx=10, pady=(10, 5))
+        self.search = ttk.Entry(self, width=30, font=("SF Pro Text", 13))
+        self.search.pack(fill="x", padx=10)
+        self.search.bind("<KeyRelease>", lambda e: self.assignment_list.set_prefix(self.search.get()))
 
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.assignment_tree.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.assignment_tree.configure(yscrollcommand=scrollbar.set)
+        self.assignment_list = VirtualList(
+            self, controller.assignment_rows, ("Assignment Name", "Due Date"),
+            lambda assignment: (assignment.name, assignment.due_date.strftime('%Y-%m-%d'))
+        )
+        self.assignment_list.pack(fill="both", expand=True, padx=10, pady=20)
 
         self.update_assignment_list()
 
     def add_assignment(self):
+        if not self.controller.book_available():
+            return
         name = self.assignment_name.get()
         due_date = datetime.strptime(self.due_date.get(), "%m-%d-%Y")
         assignment = Assignment(str(len(self.controller.procrast.assignments)), name, datetime.now(), due_date)
@@ -248,10 +432,7 @@ class AssignmentsFrame(ttk.Frame):
         self.due_date.delete(0, 'end')
 
     def update_assignment_list(self):
-        for item in self.assignment_tree.get_children():
-            self.assignment_tree.delete(item)
-        for assignment in self.controller.procrast.assignments:
-            self.assignment_tree.insert("", "end", values=(assignment.name, assignment.due_date.strftime('%Y-%m-%d')))
+        self.assignment_list.refresh()
 
 class BettingFrame(ttk.Frame):
     def __init__(self, parent, controller):
@@ -262,16 +443,18 @@ class BettingFrame(ttk.Frame):
         label.pack(anchor="w", pady=(0, 20))
 
         ttk.Label(self, text="User:").pack(anchor="w", padx=10, pady=(10, 5))
+        # Type-ahead: the dropdown only ever holds the names matching what was typed
         self.user_var = tk.StringVar()
-        self.user_menu = ttk.Combobox(self, textvariable=self.user_var, state="readonly", 
-                                      font=("SF Pro Text", 13))
+        self.user_menu = ttk.Combobox(self, textvariable=self.user_var, font=("SF Pro Text", 13))
         self.user_menu.pack(fill="x", padx=10, pady=(0, 10))
+        self.user_menu.bind("<KeyRelease>", lambda e: self._suggest(self.user_menu, controller.user_rows))
 
         ttk.Label(self, text="Assignment:").pack(anchor="w", padx=10, pady=(10, 5))
         self.assignment_var = tk.StringVar()
-        self.assignment_menu = ttk.Combobox(self, textvariable=self.assignment_var, state="readonly", 
-                                            font=("SF Pro Text", 13))
+        self.assignment_menu = ttk.Combobox(self, textvariable=self.assignment_var, font=("SF Pro Text", 13))
         self.assignment_menu.pack(fill="x", padx=10, pady=(0, 10))
+        self.assignment_menu.bind("<KeyRelease>",
+                                  lambda e: self._suggest(self.assignment_menu, controller.assignment_rows))
 
         ttk.Label(self, text="Bet Amount:").pack(anchor="w", padx=10, pady=(10, 5))
         self.bet_amount = ttk.Entry(self, width=30, font=("SF Pro Text", 13))
@@ -284,32 +467,44 @@ class BettingFrame(ttk.Frame):
             width=15
         )
         place_bet_button.pack(anchor="w", padx=10, pady=20)
+        controller.book_actions.append(place_bet_button)
 
         self.odds_frame = ttk.Frame(self, style="TFrame")
         self.odds_frame.pack(fill="both", expand=True, padx=10, pady=20)
+        self.odds_canvas = None
 
         self.update_user_menu()
         self.update_assignment_menu()
 
+    def _suggest(self, menu, source, prefix=None):
+        source.sync()
+        rows = source.rows
+        prefix = menu.get() if prefix is None else prefix
+        menu['values'] = [rows[i].name for i in source.names.search(prefix, SUGGESTION_LIMIT)]
+
+    def _reset_menu(self, menu, source):
+        self._suggest(menu, source, "")
+        rows = source.rows
+        menu.set(rows[0].name if len(rows) else "")
+
     def update_user_menu(self):
-        self.user_menu['values'] = [user.name for user in self.controller.procrast.users]
-        if self.user_menu['values']:
-            self.user_menu.set(self.user_menu['values'][0])
+        self._reset_menu(self.user_menu, self.controller.user_rows)
 
     def update_assignment_menu(self):
-        self.assignment_menu['values'] = [a.name for a in self.controller.procrast.assignments]
-        if self.assignment_menu['values']:
-            self.assignment_menu.set(self.assignment_menu['values'][0])
+        self._reset_menu(self.assignment_menu, self.controller.assignment_rows)
 
     def place_bet(self):
-        user = next((u for u in self.controller.procrast.users if u.name == self.user_var.get()), None)
-        assignment = next((a for a in self.controller.procrast.assignments if a.name == self.assignment_var.get()), None)
+        if not self.controller.book_available():
+            return
+        user = self.controller.user_rows.find(self.user_var.get())
+        assignment = self.controller.assignment_rows.find(self.assignment_var.get())
         amount = float(self.bet_amount.get())
 
         if user and assignment:
             current_date = self.controller.procrast.current_date
             bet = self.controller.procrast.place_bet(user, amount, current_date, [assignment])
-            if bet:
+            # The numpy engine returns the bet's row index, which is 0 for a first bet
+            if bet is not None:
                 Messagebox.show_info("Bet Placed", f"Bet of ${amount} placed on {assignment.name}")
                 self.update_odds_chart()
             else:
@@ -317,30 +512,53 @@ class BettingFrame(ttk.Frame):
         else:
             Messagebox.show_error("Error", "Invalid user or assignment")
 
-    def update_odds_chart(self):
-        for widget in self.odds_frame.winfo_children():
-            widget.destroy()
-
-        fig = Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        for assignment in self.controller.procrast.assignments:
-            odds = self.controller.procrast.get_calendar_odds(assignment)
-            dates = list(odds.keys())
-            values = list(odds.values())
-            ax.plot(dates, values, label=assignment.name)
+    def _build_odds_chart(self):
+        # Built once; later updates only swap the line data
+        Figure, FigureCanvasTkAgg = plotting()
+        from matplotlib.collections import LineCollection
+        self.odds_fig = Figure(figsize=(8, 4), dpi=100)
+        self.odds_ax = self.odds_fig.add_subplot(111)
+        # Every assignment in a single collection, so thousands of lines are one artist
+        self.odds_lines = LineCollection([], linewidths=1)
+        self.odds_ax.add_collection(self.odds_lines)
+        self.odds_ax.xaxis_date()
+        self.odds_ax.set_xlabel("Date")
+        self.odds_ax.set_ylabel("Odds")
+        self.odds_ax.set_title("Odds Over Time")
+        self.odds_ax.tick_params(axis='x', labelrotation=45)
+        self.odds_fig.tight_layout()
+        self.odds_canvas = FigureCanvasTkAgg(self.odds_fig, master=self.odds_frame)
+        self.odds_canvas.get_tk_widget().pack(fill="both", expand=True)
 
-        ax.set_xlabel("Date")
-        ax.set_ylabel("Odds")
-        ax.legend()
-        ax.set_title("Odds Over Time")
-        ax.tick_params(axis='x', labelrotation=45)
-
-        fig.tight_layout()
+    def update_odds_chart(self):
+        if self.odds_canvas is None:
+            self._build_odds_chart()
+        import numpy as np
+        from matplotlib.dates import date2num
+        from matplotlib.lines import Line2D
+
+        # One batched matrix for every assignment instead of a calendar per assignment
+        assignments = self.controller.procrast.assignments
+        dates, matrix = self.controller.procrast.get_odds_matrix(assignments)
+        ax = self.odds_ax
+        if len(matrix):
+            x = date2num(dates)
+            values = np.asarray(matrix, dtype=float)
+            self.odds_lines.set_segments([np.column_stack((x, row))[~np.isnan(row)] for row in values])
+            self.odds_lines.set_color([f"C{i % 10}" for i in range(len(values))])
+            ax.set_xlim(x[0], max(x[-1], x[0] + 1))
+            low, high = np.nanmin(values), np.nanmax(values)
+            ax.set_ylim(low - 0.05, high + 0.05)
+        else:
+            self.odds_lines.set_segments([])
 
-        canvas = FigureCanvasTkAgg(fig, master=self.odds_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if 0 < len(assignments) <= LEGEND_LIMIT:
+            ax.legend([Line2D([], [], color=f"C{i % 10}") for i in range(len(assignments))],
+                      [assignment.name for assignment in assignments])
+        self.odds_canvas.draw_idle()
 
 class UsersFrame(ttk.Frame):
     def __init__(self, parent, controller):
@@ -365,22 +583,24 @@ class UsersFrame(ttk.Frame):
             width=15
         )
         add_user_button.pack(anchor="w", padx=10, pady=20)
+        controller.book_actions.append(add_user_button)
 
-        tree_frame = ttk.Frame(self)
-        tree_frame.pack(fill="both", expand=True, padx=10, pady=20)
+        ttk.Label(self, text="Search:").pack(anchor="w", padx=10, pady=(10, 5))
+        self.search = ttk.Entry(self, width=30, font=("SF Pro Text", 13))
+        self.search.pack(fill="x", padx=10)
+        self.search.bind("<KeyRelease>", lambda e: self.user_list.set_prefix(self.search.get()))
 
-        self.user_list = ttk.Treeview(tree_frame, columns=("username", "balance"), show="headings")
-        self.user_list.heading("username", text="Username")
-        self.user_list.heading("balance", text="Balance")
-        self.user_list.pack(side="left", fill="both", expand=True)
-
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.user_list.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.user_list.configure(yscrollcommand=scrollbar.set)
+        self.user_list = VirtualList(
+            self, controller.user_rows, ("Username", "Balance"),
+            lambda user: (user.name, f"${user.balance:.2f}")
+        )
+        self.user_list.pack(fill="both", expand=True, padx=10, pady=20)
 
         self.update_user_list()
 
     def add_user(self):
+        if not self.controller.book_available():
+            return
         username = self.username.get()
         try:
             balance = float(self.initial_balance.get())
@@ -396,10 +616,7 @@ class UsersFrame(ttk.Frame):
         Messagebox.show_info("User Added", f"User {username} has been added with an initial balance of ${balance:.2f}")
 
     def update_user_list(self):
-        for item in self.user_list.get_children():
-            self.user_list.delete(item)
-        for user in self.controller.procrast.users:
-            self.user_list.insert("", "end", values=(user.name, f"${user.balance:.2f}"))
+        self.user_list.refresh()
 
 class SimulationFrame(ttk.Frame):
     def __init__(self, parent, controller):
@@ -440,15 +657,74 @@ class SimulationFrame(ttk.Frame):
         self.house_take.pack(fill="x", padx=10, pady=(0, 10))
         self.house_take.insert(0, str(self.controller.procrast.house_take * 100))
 
-        run_simulation_button = create_button(
-            self, 
+        ttk.Label(self, text="Simulation Engine:").pack(anchor="w", padx=10, pady=(10, 5))
+        self.engine = ttk.Combobox(self, values=['python', 'numpy'],
+                                   state="readonly", font=("SF Pro Text", 13))
+        self.engine.pack(fill="x", padx=10, pady=(0, 10))
+        self.engine.set(self.controller.engine)
+
+        buttons = ttk.Frame(self)
+        buttons.pack(anchor="w", padx=10, pady=20)
+
+        self.run_simulation_button = create_button(
+            buttons, 
             "Run Simulation", 
             self.run_simulation,
             width=15
         )
-        run_simulation_button.pack(anchor="w", padx=10, pady=20)
+        self.run_simulation_button.pack(side="left")
+
+        self.cancel_button = create_button(
+            buttons,
+            "Cancel",
+            self.cancel_simulation,
+            width=10,
+            state="disabled"
+        )
+        self.cancel_button.pack(side="left", padx=(10, 0))
+
+        self.progress = ttk.Progressbar(self, mode="determinate")
+        self.progress.pack(fill="x", padx=10, pady=(0, 5))
+        self.progress_label = ttk.Label(self, text="", font=("SF Pro Text", 12))
+        self.progress_label.pack(anchor="w", padx=10)
+
+        self.live_canvas = None
+        self.worker = None
+
+    def _build_live_chart(self):
+        # Live completion rate, updated in place while the worker runs; built
+        # on the first run so opening the app does not load matplotlib
+        Figure, FigureCanvasTkAgg = plotting()
+        self.live_fig = Figure(figsize=(6, 2.5), dpi=100)
+        self.live_ax = self.live_fig.add_subplot(111)
+        # Axes limits are fixed for a run, so progress updates blit the line over
+        # a saved background instead of redrawing the figure
+        self.live_line, = self.live_ax.plot([], [], color='#007AFF', animated=True)
+        self.live_ax.set_title("Completion Rate")
+        self.live_ax.set_ylim(0, 1)
+        self.live_fig.tight_layout()
+        self.live_canvas = FigureCanvasTkAgg(self.live_fig, master=self)
+        self.live_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self.live_background = None
+        self.live_canvas.mpl_connect('draw_event', self._save_live_background)
+
+    def _save_live_background(self, event):
+        # Full draws (first show, resizes, new run) refresh the blit background
+        self.live_background = self.live_canvas.copy_from_bbox(self.live_ax.bbox)
+        self.live_ax.draw_artist(self.live_line)
+
+    def _blit_live_line(self):
+        if self.live_background is None:
+            self.live_canvas.draw_idle()
+            return
+        self.live_canvas.restore_region(self.live_background)
+        self.live_ax.draw_artist(self.live_line)
+        self.live_canvas.blit(self.live_ax.bbox)
 
     def run_simulation(self):
+        if self.worker is not None:
+            return
+
         num_users = int(self.num_users.get())
         num_assignments = int(self.num_assignments.get())
         duration = self.sim_duration.get()
@@ -456,8 +732,16 @@ class SimulationFrame(ttk.Frame):
         completion_rate_std = float(self.completion_rate_std.get())
         house_take = float(self.house_take.get()) / 100
 
+        engine = self.engine.get()
+        if engine != self.controller.engine:
+            try:
+                self.controller.use_engine(engine)
+            except ImportError:
+                Messagebox.show_error("Engine Unavailable", "The numpy engine requires numpy to be installed.")
+                self.engine.set(self.controller.engine)
+                return
+
         self.controller.procrast.house_take = house_take
-        self.controller.procrast.generate_random_data(num_users, num_assignments, 100, 1000, 1, 30)
 
         if duration == 'week':
             days = 7
@@ -468,15 +752,72 @@ class SimulationFrame(ttk.Frame):
         elif duration == 'year':
             days = 365
 
-        for day in range(days):
-            self.controller.procrast.simulate_day(completion_rate_mean, completion_rate_std)
+        if self.live_canvas is None:
+            self._build_live_chart()
+        self.live_days = []
+        self.live_rates = []
+        self.live_line.set_data([], [])
+        self.live_ax.set_xlim(0, days)
+        self.live_background = None
+        self.live_canvas.draw_idle()
+        self.progress.configure(maximum=days, value=0)
+        self.progress_label.config(text="Generating data...")
+        self.run_simulation_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+        self.controller.set_book_busy(True)
+
+        self.worker = SimulationWorker(self.controller.procrast, days, (num_users, num_assignments, 100, 1000, 1, 30),
+                                       completion_rate_mean, completion_rate_std)
+        self.worker.start()
+        self.after(50, self._poll_worker)
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def _poll_worker(self):
+        # Drain everything the worker has produced, then redraw once
+        finished = None
+        try:
+            while True:
+                message = self.worker.messages.get_nowait()
+                if message[0] == "progress":
+                    _, day, days, stat = message
+                    self.live_days.append(day)
+                    self.live_rates.append(stat['completion_rate'])
+                    self.progress.configure(value=day)
+                    self.progress_label.config(text=f"Day {day} of {days}")
+                else:
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        self.live_line.set_data(self.live_days, self.live_rates)
+        self._blit_live_line()
+        self.controller.frames['DashboardFrame'].refresh()
+
+        if finished is None:
+            self.after(50, self._poll_worker)
+            return
 
-        house_take, remaining_pool = self.controller.procrast.finalize_simulation()
-        daily_stats = self.controller.procrast.get_daily_stats()
+        self.worker = None
+        self.run_simulation_button.configure(state="normal")
+        self.cancel_button.configure(state="disabled")
+        self.controller.set_book_busy(False)
+
+        if finished[0] == "done":
+            _, house_take, remaining_pool = finished
+            self.progress_label.config(text="Simulation complete")
+            daily_stats = self.controller.procrast.get_daily_stats()
+            self.controller.frames['SimulationResultsFrame'].display_results(house_take, remaining_pool, daily_stats)
+            self.controller.show_frame("SimulationResultsFrame")
+        elif finished[0] == "cancelled":
+            self.progress_label.config(text=f"Cancelled after {finished[1]} days")
+        else:
+            self.progress_label.config(text="Simulation failed")
+            Messagebox.show_error("Simulation Error", str(finished[1]))
 
-        self.controller.frames['SimulationResultsFrame'].display_results(house_take, remaining_pool, daily_stats)
-        self.controller.show_frame("SimulationResultsFrame")
-        
         self.controller.frames['UsersFrame'].update_user_list()
         self.controller.frames['AssignmentsFrame'].update_assignment_list()
         self.controller.frames['BettingFrame'].update_user_menu()
@@ -493,6 +834,10 @@ class SimulationResultsFrame(ttk.Frame):
         self.label = ttk.Label(self, text="Simulation Results", font=("SF Pro Display", 24, "bold"))
         self.label.grid(row=0, column=0, sticky="w", pady=(0, 20), padx=10)
 
+        export_button = create_button(self, "Export Results", self.export_results, width=15)
+        export_button.grid(row=0, column=0, sticky="e", pady=(0, 20), padx=10)
+        controller.book_actions.append(export_button)
+
         self.canvas = tk.Canvas(self)
         self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = ttk.Frame(self.canvas)
@@ -511,82 +856,138 @@ class SimulationResultsFrame(ttk.Frame):
         self.scrollbar.grid(row=1, column=1, sticky="ns", pady=(0, 10))
 
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.results_canvas = None
 
     def _on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
-    def display_results(self, house_take, remaining_pool, daily_stats):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def _build_results_chart(self):
+        # Built once; each run replaces the text and the plotted data in place
+        Figure, FigureCanvasTkAgg = plotting()
+        self.results_text = tk.Text(self.scrollable_frame, height=10, width=80, font=("SF Pro Text", 13),
+                                    bg="white", highlightthickness=0, bd=0)
+        self.results_text.pack(fill="x", padx=10, pady=10)
 
-        results_text = tk.Text(self.scrollable_frame, height=10, width=80, font=("SF Pro Text", 13), 
-                               bg="white", highlightthickness=0, bd=0)
-        results_text.pack(fill="x", padx=10, pady=10)
+        self.results_fig = Figure(figsize=(10, 12), dpi=100)
+        gs = self.results_fig.add_gridspec(3, 1, height_ratios=[1, 1, 1])
 
+        # Completion rate over time
+        self.rate_ax = self.results_fig.add_subplot(gs[0, 0])
+        self.rate_line, = self.rate_ax.plot([], [], color='#007AFF')
+        self.rate_ax.xaxis_date()
+        self.rate_ax.set_title("Completion Rate Over Time")
+        self.rate_ax.set_xlabel("Date")
+        self.rate_ax.set_ylabel("Completion Rate")
+        self.rate_ax.tick_params(axis='x', rotation=45)
+
+        # Total bets vs Completed bets, one step patch per series rather than a bar per day
+        self.bets_ax = self.results_fig.add_subplot(gs[1, 0])
+        self.total_steps = self.bets_ax.stairs([0], [0, 1], fill=True, label="Total Bets", alpha=0.5, color='#5AC8FA')
+        self.completed_steps = self.bets_ax.stairs([0], [0, 1], fill=True, label="Completed Bets", alpha=0.5,
+                                                   color='#4CD964')
+        self.bets_ax.xaxis_date()
+        self.bets_ax.set_title("Total vs Completed Bets")
+        self.bets_ax.set_xlabel("Date")
+        self.bets_ax.set_ylabel("Number of Bets")
+        self.bets_ax.legend()
+        self.bets_ax.tick_params(axis='x', rotation=45)
+
+        # User balance distribution, binned before it reaches matplotlib
+        self.balance_ax = self.results_fig.add_subplot(gs[2, 0])
+        self.balance_steps = self.balance_ax.stairs([0], [0, 1], fill=True, color='#FF9500')
+        self.balance_ax.set_title("User Balance Distribution")
+        self.balance_ax.set_xlabel("Balance")
+        self.balance_ax.set_ylabel("Number of Users")
+
+        self.results_fig.tight_layout(pad=4.0)
+        self.results_canvas = FigureCanvasTkAgg(self.results_fig, master=self.scrollable_frame)
+        self.results_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+
+    def display_results(self, house_take, remaining_pool, daily_stats):
+        if self.results_canvas is None:
+            self._build_results_chart()
+        import numpy as np
+        from matplotlib.dates import date2num
+
+        procrast = self.controller.procrast
         results = f"Simulation Results:\n"
         results += f"House Take: ${house_take:.2f}\n"
         results += f"Remaining Pool: ${remaining_pool:.2f}\n\n"
         results += "Top 5 Users by Balance:\n"
-        for user in sorted(self.controller.procrast.users, key=lambda x: x.balance, reverse=True)[:5]:
+        for user in sorted(procrast.users, key=lambda x: x.balance, reverse=True)[:5]:
             results += f"{user.name}: ${user.balance:.2f}\n"
 
-        detailed_stats = self.controller.procrast.get_detailed_statistics()
+        detailed_stats = procrast.get_detailed_statistics()
         results += f"\nDetailed Statistics:\n"
         for key, value in detailed_stats.items():
             results += f"{key.replace('_', ' ').title()}: {value:.2f}\n"
 
-        results_text.insert("1.0", results)
+        self.results_text.delete("1.0", "end")
+        self.results_text.insert("1.0", results)
+
+        width = int(self.rate_ax.get_window_extent().width)
+        query = getattr(daily_stats, 'query', None)
+        if query is not None:
+            # About a row per pixel column: days, or week/month rollups for long runs
+            daily_stats = query(max_points=width)
+        if daily_stats:
+            dates = date2num([stat['date'] for stat in daily_stats])
+            edges = np.append(dates, dates[-1] + daily_stats[-1].get('days', 1))
+            rates = [stat['completion_rate'] for stat in daily_stats]
+            self.rate_line.set_data(*downsample(list(dates), rates, width))
+            self.total_steps.set_data([stat['total_bets'] for stat in daily_stats], edges)
+            self.completed_steps.set_data([stat['completed_bets'] for stat in daily_stats], edges)
+        else:
+            self.rate_line.set_data([], [])
+            self.total_steps.set_data([0], [0, 1])
+            self.completed_steps.set_data([0], [0, 1])
+
+        # The numpy engine already holds balances as an array
+        balances = getattr(procrast, 'user_balance', None)
+        if balances is None:
+            balances = np.fromiter((user.balance for user in procrast.users), dtype=float, count=len(procrast.users))
+        if len(balances):
+            counts, bins = np.histogram(balances, bins=30)
+            self.balance_steps.set_data(counts, bins)
+        else:
+            self.balance_steps.set_data([0], [0, 1])
 
-        fig = Figure(figsize=(16, 24), dpi=100)
-        gs = fig.add_gridspec(3, 1, height_ratios=[1, 1, 1])
-
-        # Completion rate over time
-        ax1 = fig.add_subplot(gs[0, 0])
-        dates = [stat['date'] for stat in daily_stats]
-        completion_rates = [stat['completion_rate'] for stat in daily_stats]
-        ax1.plot(dates, completion_rates, color='#007AFF')
-        ax1.set_title("Completion Rate Over Time")
-        ax1.set_xlabel("Date")
-        ax1.set_ylabel("Completion Rate")
-        ax1.tick_params(axis='x', rotation=45)
-
-        # Total bets vs Completed bets
-        ax2 = fig.add_subplot(gs[1, 0])
-        total_bets = [stat['total_bets'] for stat in daily_stats]
-        completed_bets = [stat['completed_bets'] for stat in daily_stats]
-        ax2.bar(dates, total_bets, label="Total Bets", alpha=0.5, color='#5AC8FA')
-        ax2.bar(dates, completed_bets, label="Completed Bets", alpha=0.5, color='#4CD964')
-        ax2.set_title("Total vs Completed Bets")
-        ax2.set_xlabel("Date")
-        ax2.set_ylabel("Number of Bets")
-        ax2.legend()
-        ax2.tick_params(axis='x', rotation=45)
-
-        # User balance distribution
-        ax3 = fig.add_subplot(gs[2, 0])
-        balances = [user.balance for user in self.controller.procrast.users]
-        ax3.hist(balances, bins=30, color='#FF9500')
-        ax3.set_title("User Balance Distribution")
-        ax3.set_xlabel("Balance")
-        ax3.set_ylabel("Number of Users")
-
-        fig.tight_layout(pad=4.0)
-
-        canvas = FigureCanvasTkAgg(fig, master=self.scrollable_frame)
-        canvas.draw()
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack(fill="both", expand=True, padx=10, pady=10)
+        for ax in (self.rate_ax, self.bets_ax, self.balance_ax):
+            ax.relim()
+            ax.autoscale_view()
+        self.results_canvas.draw_idle()
 
         self.canvas.update_idletasks()
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
+    def export_results(self):
+        if not self.controller.book_available():
+            return
+        from tkinter import filedialog
+        directory = filedialog.askdirectory(title="Export results to")
+        if not directory:
+            return
+        try:
+            from source.export import export_run
+            paths = export_run(self.controller.procrast, directory)
+        except ImportError:
+            Messagebox.show_error("Export Unavailable", "Exporting results requires pyarrow to be installed.")
+            return
+        Messagebox.show_info("Results Exported", "\n".join(paths.values()))
+
     def clear_results(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        if self.results_canvas is not None:
+            self.results_text.delete("1.0", "end")
+            self.rate_line.set_data([], [])
+            for steps in (self.total_steps, self.completed_steps, self.balance_steps):
+                steps.set_data([0], [0, 1])
+            self.results_canvas.draw_idle()
         self.canvas.update_idletasks()
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
 def main():
+    logging.basicConfig(level=os.environ.get("PROCRAST_LOG_LEVEL", "WARNING"),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
     app = ProcrastUI()
     app.mainloop()
 
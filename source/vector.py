@@ -0,0 +1,336 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+import logging
+
+import numpy as np
+
+from source.algo import DailyStats, _valid_amount
+from source.metrics import instrumented
+
+logger = logging.getLogger(__name__)
+
+# Columnar alternative to algo.Procrast for large Monte-Carlo runs. Users,
+# assignments and bets live in parallel NumPy arrays and every phase of the
+# simulation is a batched array operation. The public API mirrors Procrast so
+# the UI can drive either engine.
+
+# Sub-streams of the root SeedSequence, mirroring algo.RandomStreams
+USERS, ASSIGNMENTS, BETS, COMPLETION = range(4)
+
+class Views(Sequence):
+    # Lazy list of row views: len() and indexing never build a view per row
+    def __init__(self, engine, view, size):
+        self._engine = engine
+        self._view = view
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._view(self._engine, j) for j in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        return self._view(self._engine, i)
+
+class UserView:
+    def __init__(self, engine, index):
+        self._engine = engine
+        self.index = index
+
+    @property
+    def name(self):
+        return self._engine.user_names[self.index]
+
+    @property
+    def balance(self):
+        return float(self._engine.user_balance[self.index])
+
+    @balance.setter
+    def balance(self, value):
+        self._engine.user_balance[self.index] = value
+
+    @property
+    def bets(self):
+        return np.flatnonzero(self._engine.bet_user == self.index)
+
+class AssignmentView:
+    def __init__(self, engine, index):
+        self._engine = engine
+        self.index = index
+
+    @property
+    def id(self):
+        return self._engine.assignment_ids[self.index]
+
+    @property
+    def name(self):
+        return self._engine.assignment_names[self.index]
+
+    @property
+    def open_date(self):
+        return self._engine._to_datetime(self._engine.assignment_open[self.index])
+
+    @property
+    def due_date(self):
+        return self._engine._to_datetime(self._engine.assignment_due[self.index])
+
+    @property
+    def bets(self):
+        return np.flatnonzero(self._engine.bet_assignment == self.index)
+
+class VectorProcrast:
+    def __init__(self, seed=None):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.streams = {USERS: self.substream(USERS), ASSIGNMENTS: self.substream(ASSIGNMENTS)}
+        self.generations = 0  # generate_random_data calls so far; keys their bet streams
+        self.house_take = 0.05  # 5% house take by default
+        self.metrics = None  # optional metrics.Metrics collecting counters and latencies
+        self._clear()
+
+    def _clear(self):
+        self.current_date = datetime.now()
+        self.daily_stats = DailyStats(None)  # never covers skipped days, so needs no streams
+
+        self.user_names = []
+        self.user_balance = np.empty(0, dtype=np.float64)
+
+        self.assignment_ids = []
+        self.assignment_names = []
+        self.assignment_open = np.empty(0, dtype=np.int64)  # day ordinals
+        self.assignment_due = np.empty(0, dtype=np.int64)
+
+        self.bet_user = np.empty(0, dtype=np.int64)
+        self.bet_assignment = np.empty(0, dtype=np.int64)
+        self.bet_amount = np.empty(0, dtype=np.float64)
+        self.bet_day = np.empty(0, dtype=np.int64)  # selected date ordinals
+        self.bet_completed = np.empty(0, dtype=bool)
+        self.bet_return = np.empty(0, dtype=np.float64)
+
+        self._settle_index = None
+        self._stake_index = None
+
+    def substream(self, *key):
+        # Same as SeedSequence.spawn, but addressable: a key always maps to the same stream
+        return np.random.default_rng(np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=key))
+
+    def _to_datetime(self, ordinal):
+        return self.current_date + timedelta(days=int(ordinal) - self.current_date.toordinal())
+
+    @property
+    def users(self):
+        return Views(self, UserView, len(self.user_names))
+
+    @property
+    def assignments(self):
+        return Views(self, AssignmentView, len(self.assignment_names))
+
+    def add_user(self, user):
+        self.user_names.append(user.name)
+        self.user_balance = np.append(self.user_balance, user.balance)
+        logger.info("Added user: %s", user.name)
+
+    def add_assignment(self, assignment):
+        self.assignment_ids.append(assignment.id)
+        self.assignment_names.append(assignment.name)
+        self.assignment_open = np.append(self.assignment_open, assignment.open_date.toordinal())
+        self.assignment_due = np.append(self.assignment_due, assignment.due_date.toordinal())
+        logger.info("Added assignment: %s", assignment.name)
+
+    def reset(self):
+        self._clear()
+        logger.info("Reset Procrast instance")
+
+    def generate_random_data(self, num_users, num_assignments, min_balance, max_balance, min_duration, max_duration):
+        existing_users_count = len(self.user_names)
+        new_users = max(num_users - existing_users_count, 0)
+        self.user_names.extend(f"User_{i}" for i in range(existing_users_count, num_users))
+        self.user_balance = np.concatenate([self.user_balance, self.streams[USERS].uniform(min_balance, max_balance, new_users)])
+
+        today = self.current_date.toordinal()
+        rng = self.streams[ASSIGNMENTS]
+        open_days = today + rng.integers(0, 31, num_assignments)
+        due_days = open_days + rng.integers(min_duration, max_duration + 1, num_assignments)
+        self.assignment_ids.extend(str(i) for i in range(num_assignments))
+        self.assignment_names.extend(f"Assignment_{i}" for i in range(num_assignments))
+        self.assignment_open = np.concatenate([self.assignment_open, open_days])
+        self.assignment_due = np.concatenate([self.assignment_due, due_days])
+
+        if not self.assignment_names:
+            return
+
+        # Each user places 1-5 bets on a random assignment, dated inside its window
+        rng = self.substream(BETS, self.generations)
+        self.generations += 1
+        counts = rng.integers(1, 6, len(self.user_names))
+        users = np.repeat(np.arange(len(self.user_names)), counts)
+        targets = rng.integers(0, len(self.assignment_names), users.size)
+        amounts = rng.uniform(10, 100, users.size)
+        spans = self.assignment_due[targets] - self.assignment_open[targets] + 1
+        days = self.assignment_open[targets] + (rng.random(users.size) * spans).astype(np.int64)
+
+        accepted = self._affordable(users, counts, amounts)
+        self._book(users[accepted], targets[accepted], amounts[accepted], days[accepted])
+
+    def _affordable(self, users, counts, amounts):
+        # Same rule as placing the bets one by one: a bet is refused when it exceeds
+        # what the user has left, and a refused bet does not consume balance.
+        remaining = self.user_balance.copy()
+        rank = np.arange(users.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        accepted = np.zeros(users.size, dtype=bool)
+        for k in range(int(counts.max(initial=0))):
+            rows = np.flatnonzero(rank == k)
+            ok = remaining[users[rows]] >= amounts[rows]
+            remaining[users[rows[ok]]] -= amounts[rows[ok]]
+            accepted[rows[ok]] = True
+        return accepted
+
+    def _book(self, users, targets, amounts, days):
+        np.subtract.at(self.user_balance, users, amounts)
+        self.bet_user = np.concatenate([self.bet_user, users])
+        self.bet_assignment = np.concatenate([self.bet_assignment, targets])
+        self.bet_amount = np.concatenate([self.bet_amount, amounts])
+        self.bet_day = np.concatenate([self.bet_day, days])
+        self.bet_completed = np.concatenate([self.bet_completed, np.zeros(users.size, dtype=bool)])
+        self.bet_return = np.concatenate([self.bet_return, np.full(users.size, np.nan)])
+        self._settle_index = None
+        self._stake_index = None
+
+    @instrumented("place_bet")
+    def place_bet(self, user, amount, selected_date, assignments):
+        if len(assignments) != 1:
+            raise ValueError("VectorProcrast books each bet against exactly one assignment")
+        if not _valid_amount(amount):
+            logger.warning("Invalid bet amount %r for user %s", amount, user.name)
+            return None
+        if user.balance < amount:
+            logger.warning("Insufficient balance for user %s", user.name)
+            return None
+        assignment = assignments[0]
+        self._book(np.array([user.index]), np.array([assignment.index]),
+                   np.array([amount], dtype=np.float64), np.array([selected_date.toordinal()]))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Placed bet: User %s, Amount $%.2f, Assignments: %s", user.name, amount, [a.name for a in assignments])
+        return len(self.bet_amount) - 1
+
+    def _stakes(self):
+        # Bets sorted by (assignment, day) with a running stake total, so the amount
+        # bet on an assignment up to a day is two searchsorted lookups.
+        if self._stake_index is None:
+            first_day = int(self.bet_day.min()) if self.bet_day.size else 0
+            width = int(self.bet_day.max()) - first_day + 2 if self.bet_day.size else 2
+            keys = self.bet_assignment * width + (self.bet_day - first_day)
+            order = np.argsort(keys, kind="stable")
+            cumulative = np.concatenate([[0.0], np.cumsum(self.bet_amount[order])])
+            self._stake_index = (first_day, width, keys[order], cumulative)
+        return self._stake_index
+
+    def _odds(self, assignments, days):
+        first_day, width, keys, cumulative = self._stakes()
+        offsets = np.clip(days - first_day, -1, width - 2)
+        hi = np.searchsorted(keys, assignments * width + offsets, side="right")
+        lo = np.searchsorted(keys, assignments * width, side="left")
+        total_bet = cumulative[hi] - cumulative[lo]
+
+        due = self.assignment_due[assignments]
+        time_factor = (due - days) / (due - self.assignment_open[assignments])
+        base_odds = 1 + (0.5 * time_factor)
+        return np.where(total_bet > 0, np.maximum(base_odds, 1 - self.house_take), base_odds)
+
+    @instrumented("calculate_odds")
+    def calculate_odds(self, assignment, date):
+        return float(self._odds(np.array([assignment.index]), np.array([date.toordinal()]))[0])
+
+    def get_calendar_odds(self, assignment):
+        open_day = int(self.assignment_open[assignment.index])
+        days = np.arange(open_day, int(self.assignment_due[assignment.index]) + 1)
+        odds = self._odds(np.full(days.size, assignment.index), days)
+        start = assignment.open_date
+        return {start + timedelta(days=i): float(o) for i, o in enumerate(odds)}
+
+    def get_odds_matrix(self, assignments=None):
+        # Same layout as Procrast.get_odds_matrix: assignments x calendar days, NaN
+        # outside each assignment's window, computed as one broadcast lookup
+        index = np.arange(len(self.assignment_names)) if assignments is None else np.array([a.index for a in assignments], dtype=np.int64)
+        if index.size == 0:
+            return [], np.empty((0, 0))
+        open_days = self.assignment_open[index]
+        due_days = self.assignment_due[index]
+        days = np.arange(int(open_days.min()), int(due_days.max()) + 1)
+        grid_assignments = np.broadcast_to(index[:, None], (index.size, days.size))
+        grid_days = np.broadcast_to(days[None, :], (index.size, days.size))
+        inside = (grid_days >= open_days[:, None]) & (grid_days <= due_days[:, None])
+
+        matrix = np.full((index.size, days.size), np.nan)
+        matrix[inside] = self._odds(grid_assignments[inside], grid_days[inside])
+        dates = [datetime.fromordinal(int(day)) for day in days]
+        return dates, matrix
+
+    def _due_slice(self, day):
+        if self._settle_index is None:
+            due = self.assignment_due[self.bet_assignment]
+            order = np.argsort(due, kind="stable")
+            self._settle_index = (due[order], order)
+        due_sorted, order = self._settle_index
+        lo, hi = np.searchsorted(due_sorted, [day, day + 1])
+        return order[lo:hi]
+
+    @instrumented("simulate_day")
+    def simulate_day(self, completion_rate_mean=0.7, completion_rate_std=0.1):
+        rng = self.substream(COMPLETION, self.current_date.toordinal())
+        daily_completion_rate = min(max(rng.normal(completion_rate_mean, completion_rate_std), 0), 1)
+
+        settling = self._due_slice(self.current_date.toordinal())
+        completed = rng.random(settling.size) < daily_completion_rate
+        self.bet_completed[settling] = completed
+
+        self.daily_stats.append({
+            'date': self.current_date,
+            'completion_rate': daily_completion_rate,
+            'total_bets': int(settling.size),
+            'completed_bets': int(completed.sum())
+        })
+
+        self.current_date += timedelta(days=1)
+        logger.info("Simulated day: %s, Completion rate: %.2f", self.current_date, daily_completion_rate)
+
+    @instrumented("finalize_simulation")
+    def finalize_simulation(self):
+        total_pool = float(self.bet_amount.sum())
+        house_take = total_pool * self.house_take
+        prize_pool = total_pool - house_take
+
+        # Parimutuel settlement, as in Procrast: claims are stake x odds and are
+        # scaled down together when they exceed the prize pool
+        winners = np.flatnonzero(self.bet_completed)
+        odds = self._odds(self.bet_assignment[winners], self.bet_day[winners])
+        claims = self.bet_amount[winners] * odds
+        self.bet_return[winners] = claims
+        total_claims = float(claims.sum())
+        scale = 1.0 if total_claims <= prize_pool else prize_pool / total_claims
+        np.add.at(self.user_balance, self.bet_user[winners], claims * scale)
+        prize_pool -= total_claims * scale
+
+        return house_take, prize_pool
+
+    def get_detailed_statistics(self):
+        total_bets = int(self.bet_amount.size)
+        total_bet_amount = float(self.bet_amount.sum())
+        completed_bets = int(self.bet_completed.sum())
+        stats = {
+            "total_users": len(self.user_names),
+            "total_assignments": len(self.assignment_names),
+            "total_bets": total_bets,
+            "total_bet_amount": total_bet_amount,
+            "average_bet_amount": total_bet_amount / total_bets if total_bets > 0 else 0,
+            "completed_bets": completed_bets,
+            "completion_rate": completed_bets / total_bets if total_bets > 0 else 0,
+            "house_take_percentage": self.house_take * 100
+        }
+        return stats
+
+    def get_daily_stats(self):
+        return self.daily_stats
@@ -0,0 +1,75 @@
+from datetime import timedelta
+import queue
+import threading
+
+from source.algo import Procrast
+from source.metrics import profile_run
+from source.scheduler import Scheduler, SETTLE
+
+# Runs a whole simulation off the UI thread. Progress is streamed through
+# `messages` as tuples:
+#   ("progress", day, days, daily_stat)  after every simulated day (for Procrast,
+#                                         every day on which something settled,
+#                                         and the last day)
+#   ("done", house_take, remaining_pool)  once the run is finalized
+#   ("cancelled", day)                    if cancel() stopped the run early
+#   ("error", exception)                  if the run raised
+# With `profile_path` set the run is cProfiled and its stats written there.
+class SimulationWorker(threading.Thread):
+    def __init__(self, procrast, days, generate_args, completion_rate_mean=0.7, completion_rate_std=0.1,
+                 profile_path=None):
+        super().__init__(daemon=True)
+        self.procrast = procrast
+        self.days = days
+        self.generate_args = generate_args
+        self.completion_rate_mean = completion_rate_mean
+        self.completion_rate_std = completion_rate_std
+        self.profile_path = profile_path
+        self.messages = queue.Queue()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        if self.profile_path is None:
+            self._run()
+        else:
+            with profile_run(self.profile_path):
+                self._run()
+
+    def _run(self):
+        try:
+            self.procrast.generate_random_data(*self.generate_args)
+            if isinstance(self.procrast, Procrast):
+                if not self._run_events():
+                    return
+            else:
+                for day in range(self.days):
+                    if self._cancelled.is_set():
+                        self.messages.put(("cancelled", day))
+                        return
+                    self.procrast.simulate_day(self.completion_rate_mean, self.completion_rate_std)
+                    self.messages.put(("progress", day + 1, self.days, self.procrast.daily_stats[-1]))
+            house_take, remaining_pool = self.procrast.finalize_simulation()
+            self.messages.put(("done", house_take, remaining_pool))
+        except Exception as e:
+            self.messages.put(("error", e))
+
+    def _run_events(self):
+        # Event-driven: only days on which assignments settle cost anything
+        start = self.procrast.current_date
+        scheduler = Scheduler(self.procrast, self.completion_rate_mean, self.completion_rate_std)
+        reported = 0
+        for when, kind, result in scheduler.events(start + timedelta(days=self.days)):
+            day = (when.toordinal() - start.toordinal()) + 1
+            if kind == SETTLE:
+                self.messages.put(("progress", day, self.days, result))
+                reported = day
+            if self._cancelled.is_set():
+                self.messages.put(("cancelled", day))
+                return False
+        if reported < self.days:
+            # The last days settled nothing; report the run as complete
+            self.messages.put(("progress", self.days, self.days, self.procrast.daily_stats[-1]))
+        return True